@@ -26,7 +26,7 @@ from vf3_scene_assembly import (
     create_bone_hierarchy, create_child_attachment_nodes, is_core_body_part
 )
 from vf3_dynamic_visual import process_dynamic_visual_meshes
-from vf3_armature import create_gltf_armature, create_mesh_skin
+from vf3_armature import create_gltf_armature, create_mesh_skin, expand_rigid_skins
 
 
 def process_attachments(attachments: List, world_transforms: Dict, scene: trimesh.Scene, 
@@ -367,6 +367,9 @@ def export_glb(scene: trimesh.Scene, out_path: str) -> None:
     if not scene.geometry:
         raise ValueError("Scene has no geometry to export!")
     
+    # Build the per-vertex skin buffers only now that the scene is final
+    expand_rigid_skins(scene)
+    
     print(f"Exporting scene with {len(scene.geometry)} geometries to {out_path}")
     scene.export(out_path)
 
@@ -7,6 +7,19 @@ import numpy as np
 import trimesh
 from typing import Dict, List, Any, Tuple, Optional
 
+# Scene metadata key holding the one inverse bind matrix array shared by every
+# skinned mesh. Meshes only store this key, so trimesh's glTF exporter (which
+# serializes each mesh's metadata into its own extras) writes the array once.
+SHARED_IBM_KEY = 'vf3_shared_ibm'
+
+# Mesh metadata key marking a mesh rigidly bound to a single joint
+RIGID_JOINT_KEY = 'vf3_rigid_joint'
+
+# Read-only JOINTS_0/WEIGHTS_0 buffers keyed by (joint index, vertex count).
+# Rigid skins on the same joint with the same vertex count are identical, so
+# those meshes share one pair of arrays.
+_skin_buffer_cache: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
 def create_gltf_armature(bones: Dict, scene: trimesh.Scene, world_transforms: Dict) -> Tuple[Any, Dict[str, int], np.ndarray]:
     """Create a proper glTF armature with real bones and skin binding.
     
@@ -15,7 +28,8 @@ def create_gltf_armature(bones: Dict, scene: trimesh.Scene, world_transforms: Di
     Returns:
         - armature_node: The root armature node
         - joint_indices: Mapping from bone names to joint indices  
-        - inverse_bind_matrices: Array of inverse bind matrices for skinning
+        - inverse_bind_matrices: C-contiguous (N, 4, 4) float32 array of inverse
+          bind matrices for skinning, ready to be written as a MAT4 accessor
     """
     
     print("? Creating glTF armature with proper skeletal animation...")
@@ -25,67 +39,81 @@ def create_gltf_armature(bones: Dict, scene: trimesh.Scene, world_transforms: Di
     joint_indices = {bone_name: i for i, bone_name in enumerate(bone_order)}
     
     # Step 2: Create inverse bind matrices 
-    # These transform from mesh space to bone space
-    inverse_bind_matrices = np.zeros((len(bone_order), 4, 4), dtype=np.float32)
+    # These transform from mesh space to bone space. World positions are
+    # aligned to bone_order once; bones without one stay at the origin and
+    # get an identity inverse bind.
+    bind_positions = [world_transforms.get(bone_name) for bone_name in bone_order]
+    positions = np.zeros((len(bone_order), 3), dtype=np.float32)
     
-    for i, bone_name in enumerate(bone_order):
-        if bone_name in world_transforms:
-            world_pos = world_transforms[bone_name]
-            
-            # Create bind pose matrix (world transform of bone in bind pose)
-            bind_matrix = np.eye(4, dtype=np.float32)
-            bind_matrix[:3, 3] = np.array(world_pos, dtype=np.float32)
-            
-            # Inverse bind matrix transforms from mesh space to bone space
-            inverse_bind_matrices[i] = np.linalg.inv(bind_matrix)
-            
-            print(f"  Joint {i}: '{bone_name}' at {world_pos}, inverse bind computed")
+    for i, world_pos in enumerate(bind_positions):
+        if world_pos is not None:
+            positions[i] = world_pos
+            print(f"  Joint {i}: '{bone_order[i]}' at {world_pos}, inverse bind computed")
         else:
-            # Identity for bones without world transforms
-            inverse_bind_matrices[i] = np.eye(4, dtype=np.float32)
-            print(f"  Joint {i}: '{bone_name}' at origin, identity inverse bind")
+            print(f"  Joint {i}: '{bone_order[i]}' at origin, identity inverse bind")
+    
+    inverse_bind_matrices = np.empty((len(bone_order), 4, 4), dtype=np.float32)
+    _fill_translation_ibm(positions, inverse_bind_matrices)
+    
+    scene.metadata[SHARED_IBM_KEY] = inverse_bind_matrices
+    
+    # Steps 3-5 only collect (frame_from, frame_to, matrix) edges; they are
+    # written to the scene graph in one batch, in the same order as before.
+    # frame_from=None means the graph's base frame.
+    edges = []
     
     # Step 3: Create joint nodes with LOCAL transforms (not world)
-    joint_nodes = []
+    local_matrices = np.tile(np.eye(4), (len(bone_order), 1, 1))
+    append_edge = edges.append
     for i, bone_name in enumerate(bone_order):
-        bone = bones[bone_name]
+        translation = bones[bone_name].translation
         
         # Use LOCAL transform relative to parent
-        local_matrix = np.eye(4, dtype=np.float32)
-        local_matrix[:3, 3] = np.array(bone.translation, dtype=np.float32)
-        
-        # Create joint node with local transform
-        joint_node = scene.graph.update(
-            frame_to=f"joint_{bone_name}",
-            matrix=local_matrix
-        )
-        joint_nodes.append(joint_node)
+        local_matrices[i, :3, 3] = translation
+        append_edge((None, f"joint_{bone_name}", local_matrices[i]))
         
-        print(f"  Created joint {i}: '{bone_name}' with local transform {bone.translation}")
+        print(f"  Created joint {i}: '{bone_name}' with local transform {translation}")
     
     # Step 4: Set up parent-child relationships for joints
     for i, bone_name in enumerate(bone_order):
-        bone = bones[bone_name]
-        if bone.parent and bone.parent in joint_indices:
-            parent_joint = f"joint_{bone.parent}"
+        parent = bones[bone_name].parent
+        if parent and parent in joint_indices:
+            parent_joint = f"joint_{parent}"
             child_joint = f"joint_{bone_name}"
-            scene.graph.update(frame_from=child_joint, frame_to=parent_joint)
+            append_edge((child_joint, parent_joint, np.eye(4)))
             print(f"  Parented {child_joint} to {parent_joint}")
     
     # Step 5: Create armature root and parent root joints to it
-    armature_node = scene.graph.update(frame_to="Armature", matrix=np.eye(4))
+    armature_node = "Armature"
+    append_edge((None, armature_node, np.eye(4)))
     
     # Find root bones (no parent) and parent them to armature
     for bone_name in bone_order:
-        bone = bones[bone_name]
-        if not bone.parent or bone.parent not in bones:
-            scene.graph.update(frame_from=f"joint_{bone_name}", frame_to="Armature")
+        parent = bones[bone_name].parent
+        if not parent or parent not in bones:
+            append_edge((f"joint_{bone_name}", armature_node, np.eye(4)))
             print(f"  Parented root joint_{bone_name} to Armature")
     
-    print(f"? Created proper glTF armature with {len(joint_nodes)} joints and inverse bind matrices")
+    _update_graph_edges(scene.graph, edges)
+    
+    assert inverse_bind_matrices.flags['C_CONTIGUOUS']
+    print(f"? Created proper glTF armature with {len(bone_order)} joints and inverse bind matrices")
     return armature_node, joint_indices, inverse_bind_matrices
 
 
+def _update_graph_edges(graph, edges: List[Tuple[Optional[str], str, np.ndarray]]) -> None:
+    """Add many transform edges to a trimesh SceneGraph in one pass.
+    
+    Equivalent to calling graph.update(frame_from=..., frame_to=..., matrix=...)
+    per edge, minus the per-call kwargs parsing and matrix copy.
+    """
+    
+    base_frame = graph.base_frame
+    add_edge = graph.transforms.add_edge
+    for frame_from, frame_to, matrix in edges:
+        add_edge(base_frame if frame_from is None else frame_from, frame_to, matrix=matrix)
+
+
 def create_mesh_skin(mesh: trimesh.Trimesh, bone_name: str, joint_indices: Dict[str, int], 
                      inverse_bind_matrices: np.ndarray) -> trimesh.Trimesh:
     """Create a skinned mesh bound to a specific bone using proper glTF skinning.
@@ -96,10 +124,11 @@ def create_mesh_skin(mesh: trimesh.Trimesh, bone_name: str, joint_indices: Dict[
         mesh: The mesh to skin
         bone_name: Name of the bone to bind to
         joint_indices: Mapping from bone names to joint indices
-        inverse_bind_matrices: Inverse bind matrices for the skin
+        inverse_bind_matrices: Inverse bind matrices for the skin (kept on the
+            scene under SHARED_IBM_KEY by create_gltf_armature)
         
     Returns:
-        Skinned mesh with proper glTF vertex attributes
+        Skinned mesh flagged for expand_rigid_skins
     """
     
     if bone_name not in joint_indices:
@@ -109,61 +138,103 @@ def create_mesh_skin(mesh: trimesh.Trimesh, bone_name: str, joint_indices: Dict[
     joint_idx = joint_indices[bone_name]
     vertex_count = len(mesh.vertices)
     
-    # Create joint indices for each vertex (glTF JOINTS_0 attribute)
-    # Each vertex can be influenced by up to 4 joints
-    joint_ids = np.zeros((vertex_count, 4), dtype=np.uint16)
-    joint_ids[:, 0] = joint_idx  # Bind all vertices to this joint
-    # Other indices remain 0 (will be ignored due to zero weights)
-    
-    # Create vertex weights (glTF WEIGHTS_0 attribute)  
-    # Each vertex has 4 weights corresponding to the 4 joint indices
-    weights = np.zeros((vertex_count, 4), dtype=np.float32)
-    weights[:, 0] = 1.0  # Full weight to the first (and only) joint
-    # Other weights remain 0
-    
-    # Store glTF skinning attributes
-    if not hasattr(mesh, 'vertex_attributes'):
-        mesh.vertex_attributes = {}
-    
-    mesh.vertex_attributes['JOINTS_0'] = joint_ids
-    mesh.vertex_attributes['WEIGHTS_0'] = weights
-    
-    # Store reference to the skin data (trimesh will use this for glTF export)
+    # Every VF3 mesh is rigidly bound to one bone with weight 1.0, so only the
+    # joint index is recorded here. The 4-wide JOINTS_0/WEIGHTS_0 buffers are
+    # built just before export by expand_rigid_skins.
     if not hasattr(mesh, 'metadata'):
         mesh.metadata = {}
     
+    mesh.metadata[RIGID_JOINT_KEY] = joint_idx
     mesh.metadata['skin_joints'] = list(joint_indices.keys())
-    mesh.metadata['skin_joint_matrices'] = inverse_bind_matrices
+    # Reference the scene-level array rather than copying it onto every mesh
+    mesh.metadata['skin_joint_matrices'] = SHARED_IBM_KEY
     
     print(f"  ? Skinned mesh to joint {joint_idx} ('{bone_name}') with {vertex_count} vertices")
     return mesh
 
 
+def expand_rigid_skins(scene: trimesh.Scene) -> int:
+    """Materialize glTF skinning attributes for rigidly skinned meshes.
+    
+    Call right before exporting; meshes flagged by create_mesh_skin get their
+    JOINTS_0/WEIGHTS_0 vertex attributes.
+    
+    Returns:
+        Number of meshes that were expanded
+    """
+    
+    expanded = 0
+    for geom in scene.geometry.values():
+        metadata = getattr(geom, 'metadata', None)
+        if not metadata or RIGID_JOINT_KEY not in metadata:
+            continue
+        
+        joint_ids, weights = _build_rigid_skin_buffers(metadata[RIGID_JOINT_KEY], len(geom.vertices))
+        geom.vertex_attributes['JOINTS_0'] = joint_ids
+        geom.vertex_attributes['WEIGHTS_0'] = weights
+        expanded += 1
+    
+    print(f"? Expanded rigid skin buffers for {expanded} meshes")
+    return expanded
+
+
+def _build_rigid_skin_buffers(joint_idx: int, vertex_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Build 4-wide glTF JOINTS_0/WEIGHTS_0 arrays binding every vertex to one joint.
+    
+    The arrays are cached and read-only; copy them before modifying.
+    """
+    
+    key = (joint_idx, vertex_count)
+    cached = _skin_buffer_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    # Create joint indices for each vertex (glTF JOINTS_0 attribute)
+    # Each vertex can be influenced by up to 4 joints. Allocate uninitialised
+    # and fill each column once instead of zeroing the whole buffer first.
+    # Kept as uint16: trimesh 4.4.3 cannot map uint8 ('|u1') attributes to a
+    # glTF componentType, so the byte-sized layout lives in vf3_gltf_exporter.
+    joint_ids = np.empty((vertex_count, 4), dtype=np.uint16)
+    joint_ids[:, 0] = joint_idx  # Bind all vertices to this joint
+    joint_ids[:, 1:] = 0  # Other indices are ignored due to zero weights
+    
+    # Create vertex weights (glTF WEIGHTS_0 attribute)  
+    # Each vertex has 4 weights corresponding to the 4 joint indices
+    weights = np.empty((vertex_count, 4), dtype=np.float32)
+    weights[:, 0] = 1.0  # Full weight to the first (and only) joint
+    weights[:, 1:] = 0.0
+    
+    joint_ids.setflags(write=False)
+    weights.setflags(write=False)
+    _skin_buffer_cache[key] = (joint_ids, weights)
+    return joint_ids, weights
+
+
 def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
     """Get bones in hierarchical order (parents before children)."""
     
-    # Find root bones (no parent)
-    roots = [name for name, bone in bones.items() if not bone.parent or bone.parent not in bones]
+    # Find root bones (no parent) and index children once
+    roots = []
+    children_of: Dict[str, List[str]] = {}
+    for name, bone in bones.items():
+        if not bone.parent or bone.parent not in bones:
+            roots.append(name)
+        else:
+            children_of.setdefault(bone.parent, []).append(name)
     
-    # Build hierarchy using depth-first traversal
+    # Depth-first traversal with an explicit stack. Every bone has a single
+    # parent, so nothing reachable from a root is visited twice.
     ordered = []
-    visited = set()
-    
-    def visit_bone(bone_name: str):
-        if bone_name in visited or bone_name not in bones:
-            return
-        
-        visited.add(bone_name)
-        ordered.append(bone_name)
+    append = ordered.append
+    stack = sorted(roots, reverse=True)
+    while stack:
+        bone_name = stack.pop()
+        append(bone_name)
         
-        # Visit children
-        children = [name for name, bone in bones.items() if bone.parent == bone_name]
-        for child in sorted(children):  # Sort for consistent ordering
-            visit_bone(child)
-    
-    # Visit all roots
-    for root in sorted(roots):
-        visit_bone(root)
+        # Push children in reverse so they pop in sorted order
+        children = children_of.get(bone_name)
+        if children:
+            stack.extend(sorted(children, reverse=True))
     
     print(f"? Bone hierarchy order: {' -> '.join(ordered)}")
     return ordered
@@ -173,25 +244,32 @@ def create_inverse_bind_matrices(bones: Dict, world_transforms: Dict, joint_indi
     """Create inverse bind matrices for the skin.
     
     Returns:
-        Array of 4x4 inverse bind matrices, one per joint
+        C-contiguous (N, 4, 4) float32 array of inverse bind matrices, one per
+        joint; tobytes() gives the MAT4 accessor data without another copy
     """
     
     num_joints = len(joint_indices)
-    inverse_bind_matrices = np.zeros((num_joints, 4, 4), dtype=np.float32)
     
+    # Bones without world transforms keep a zero translation (identity matrix)
+    positions = np.zeros((num_joints, 3), dtype=np.float32)
     for bone_name, joint_idx in joint_indices.items():
-        if bone_name in world_transforms:
-            world_pos = world_transforms[bone_name]
-            
-            # Create world transform matrix
-            world_matrix = np.eye(4, dtype=np.float32)
-            world_matrix[:3, 3] = np.array(world_pos, dtype=np.float32)
-            
-            # Inverse bind matrix is the inverse of the world transform
-            inverse_bind_matrices[joint_idx] = np.linalg.inv(world_matrix)
-        else:
-            # Identity matrix for bones without world transforms
-            inverse_bind_matrices[joint_idx] = np.eye(4, dtype=np.float32)
+        world_pos = world_transforms.get(bone_name)
+        if world_pos is not None:
+            positions[joint_idx] = world_pos
     
+    inverse_bind_matrices = np.empty((num_joints, 4, 4), dtype=np.float32)
+    _fill_translation_ibm(positions, inverse_bind_matrices)
+    
+    assert inverse_bind_matrices.flags['C_CONTIGUOUS']
     print(f"? Created {num_joints} inverse bind matrices")
     return inverse_bind_matrices
+
+
+def _fill_translation_ibm(positions: np.ndarray, out: np.ndarray) -> None:
+    """Write the inverse of each pure-translation bind matrix into out.
+    
+    The inverse of a translation by t is a translation by -t, so no general
+    matrix inversion is needed.
+    """
+    out[:] = np.eye(4, dtype=out.dtype)
+    out[:, :3, 3] = -positions
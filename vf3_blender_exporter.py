@@ -4,12 +4,37 @@ Use Blender's Python API to create proper armatures and export to glTF.
 This should handle skeletal animation much better than manual glTF creation.
 """
 
+import functools
 import os
+import re
 import sys
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+# Blender images already built this session, keyed by (realpath, make_alpha)
+_IMG_CACHE: Dict[Tuple[str, bool], Any] = {}
+
+# Blender material lists already built this session, keyed by _material_set_key()
+_MAT_CACHE: Dict[tuple, List[Any]] = {}
+
+# PIL-decoded pixels waiting to become Blender images, keyed like _IMG_CACHE
+_DECODED_IMAGES: Dict[Tuple[str, bool], Tuple[int, int, bool, Any]] = {}
+
+# Per-connector detail logging: VF3_VERBOSE=1 for material/approach notes,
+# VF3_VERBOSE=2 adds merge/split tracing. Off by default so the f-strings are never built
+def _parse_verbosity(value: str) -> int:
+    """Read VF3_VERBOSE leniently: integers as-is, true-ish words as 1, anything else as 0."""
+    try:
+        return int(value)
+    except ValueError:
+        return 1 if value.strip().lower() in ('true', 'yes', 'on') else 0
+
+
+_VERBOSE = _parse_verbosity(os.environ.get('VF3_VERBOSE', '0'))
+_DEBUG = _VERBOSE >= 2
 
 def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transforms: Dict, 
-                                   mesh_data: Dict[str, Any], clothing_dynamic_meshes: List, output_path: str):
+                                   mesh_data: Dict[str, Any], clothing_dynamic_meshes: List, output_path: str,
+                                   quantize: bool = False):
     """Create a VF3 character in Blender with proper armature and export to glTF.
     
     Args:
@@ -18,11 +43,13 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         world_transforms: World positions of bones
         mesh_data: Dictionary mapping attachment resource_id to mesh data
         output_path: Where to save the .glb file
+        quantize: Post-process the .glb with gltfpack (KHR_mesh_quantization) if it is installed
     """
     
     try:
         import bpy
         import bmesh
+        import numpy as np
         from mathutils import Vector, Matrix
     except ImportError:
         print("? Blender Python API not available. Run this script inside Blender or install bpy module.")
@@ -30,28 +57,28 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     
     print("? Creating VF3 character in Blender...")
     
-    # Step 1: Clear existing scene
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
+    # Step 1: Clear existing scene (data API, no operator undo/poll overhead)
+    for obj in list(bpy.context.scene.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
     
-    # Step 2: Create armature
+    # Step 2: Create armature directly from data (starts with no default bone)
     print("? Creating armature...")
-    bpy.ops.object.armature_add(enter_editmode=True, location=(0, 0, 0))
-    armature_obj = bpy.context.active_object
-    armature_obj.name = "VF3_Armature"
-    armature = armature_obj.data
-    armature.name = "VF3_Armature"
+    armature = bpy.data.armatures.new("VF3_Armature")
+    armature_obj = bpy.data.objects.new("VF3_Armature", armature)
+    bpy.context.collection.objects.link(armature_obj)
+    bpy.context.view_layer.objects.active = armature_obj
+    bpy.ops.object.mode_set(mode='EDIT')
     
     # Get bone hierarchy order
-    bone_order = _get_bone_hierarchy_order(bones)
-    
-    # Clear default bone
-    bpy.ops.armature.select_all(action='SELECT')
-    bpy.ops.armature.delete()
+    children_of = _build_children(bones)
+    bone_order = _get_bone_hierarchy_order(bones, children_of)
     
     # Step 3: Create bones using original VF3 bone system (like working commit c021d46)
     created_bones = {}
     
+    # Convert world positions to Vectors once (children_of is built above)
+    world_vectors = {name: Vector(pos) for name, pos in world_transforms.items()}
+    
     for bone_name in bone_order:
         bone = bones[bone_name]
         
@@ -59,21 +86,19 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         edit_bone = armature.edit_bones.new(bone_name)
         
         # Set bone position (head at world position, tail slightly offset)
-        if bone_name in world_transforms:
-            world_pos = world_transforms[bone_name]
-            head_pos = Vector(world_pos)
-        else:
+        head_pos = world_vectors.get(bone_name)
+        if head_pos is None:
             head_pos = Vector((0, 0, 0))
         
         edit_bone.head = head_pos
         
         # Set bone tail to point toward first child for natural rotation
-        child_bones = [n for n, b in bones.items() if b.parent == bone_name]
+        child_bones = children_of.get(bone_name)
         if child_bones:
             # Point bone toward first child
             first_child_name = child_bones[0]
-            if first_child_name in world_transforms:
-                child_pos = Vector(world_transforms[first_child_name])
+            if first_child_name in world_vectors:
+                child_pos = world_vectors[first_child_name]
                 tail_direction = (child_pos - head_pos).normalized()
                 # Make sure bone has reasonable length
                 bone_length = max((child_pos - head_pos).length * 0.8, 1.0)
@@ -99,6 +124,11 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     print("? Creating and binding meshes...")
     mesh_objects = []
     
+    # Decode textures in parallel up front; material creation then only uploads pixels
+    predecoded = _predecode_textures(attachments, mesh_data)
+    if predecoded:
+        print(f"  Pre-decoded {predecoded} textures")
+    
     for att in attachments:
         if att.resource_id not in mesh_data:
             continue
@@ -117,39 +147,37 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         mesh_name = f"{att.attach_bone}_{att.resource_id}"
         blender_mesh = bpy.data.meshes.new(mesh_name)
         
-        # Apply world transform to vertices
-        vertices = trimesh_mesh.vertices.copy()
+        # Apply world transform to vertices in float32 (Blender's storage
+        # precision) so no float64 copy is made
+        vertices = trimesh_mesh.vertices.astype(np.float32)
         if att.attach_bone in world_transforms:
-            world_pos = world_transforms[att.attach_bone]
-            vertices += world_pos
+            vertices += np.asarray(world_transforms[att.attach_bone], dtype=np.float32)
+        
+        # Remove doubles/duplicates to prevent z-fighting: vertices within 1e-4 of
+        # each other are welded in NumPy before the mesh exists (no bmesh round-trip).
+        # loop_uv_indices keeps each corner's original vertex so per-vertex .X UVs
+        # still line up.
+        vertices, faces, loop_uv_indices, _kept_indices = _weld_vertices(vertices, trimesh_mesh.faces,
+                                                                         merge_distance=1e-4)
         
-        # Set mesh data
-        faces = trimesh_mesh.faces.tolist()
-        blender_mesh.from_pydata(vertices.tolist(), [], faces)
-        blender_mesh.update()
+        # Set mesh data straight from the NumPy buffers
+        _fill_mesh_from_arrays(blender_mesh, vertices, faces)
 
         # Assign UVs if available (now uses mesh_info as primary source)
-        assign_uv_coordinates(blender_mesh, trimesh_mesh, mesh_info, mesh_name)
+        assign_uv_coordinates(blender_mesh, trimesh_mesh, mesh_info, mesh_name,
+                              loop_uv_indices=loop_uv_indices)
         
-        # Clean up mesh to reduce z-fighting
-        blender_mesh.validate()  # Fix invalid geometry
-        # Remove doubles/duplicates to prevent z-fighting
-        import bmesh
-        bm = bmesh.new()
-        bm.from_mesh(blender_mesh)
-        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)  # Very small threshold
-        bm.to_mesh(blender_mesh)
-        bm.free()
-        blender_mesh.update()
+        # Clean up mesh to reduce z-fighting - the weld already dropped collapsed
+        # faces, so only let validate() rebuild the mesh if a defect remains
+        if _faces_need_validation(faces, len(vertices)):
+            blender_mesh.validate()  # Fix invalid geometry
         
         # Enable smooth shading for Gouraud-like appearance (same as VF3)
-        for poly in blender_mesh.polygons:
-            poly.use_smooth = True
+        blender_mesh.polygons.foreach_set("use_smooth", np.ones(len(blender_mesh.polygons), dtype=bool))
         print(f"  Enabled smooth shading for {mesh_name} (Gouraud rendering like VF3)")
         
-        # Create mesh object
+        # Create mesh object (linked to the scene after the loop)
         mesh_obj = bpy.data.objects.new(mesh_name, blender_mesh)
-        bpy.context.collection.objects.link(mesh_obj)
         
         # Step 5.5: Create and assign Blender materials (needed for glTF export)
         if 'materials' in mesh_info and mesh_info['materials']:
@@ -174,9 +202,11 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
             # Create vertex group for this bone
             vertex_group = mesh_obj.vertex_groups.new(name=att.attach_bone)
             
-            # Assign all vertices to this bone with weight 1.0
-            vertex_indices = list(range(len(vertices)))
-            vertex_group.add(vertex_indices, 1.0, 'REPLACE')
+            # Assign all vertices to this bone with weight 1.0. This stays a vertex
+            # group (not a bone parent) because the merge steps below join body
+            # parts and need each part's bone carried over as a group; a range
+            # is a sequence RNA accepts, so no N-int list is built per mesh.
+            vertex_group.add(range(len(vertices)), 1.0, 'REPLACE')
             
             # Add armature modifier
             armature_modifier = mesh_obj.modifiers.new(name="Armature", type='ARMATURE')
@@ -191,6 +221,16 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         
         mesh_objects.append(mesh_obj)
     
+    # Drop pre-decoded pixels that were never needed (e.g. reused by name)
+    _DECODED_IMAGES.clear()
+    
+    # Link all meshes in one batch and evaluate the depsgraph once, instead of
+    # re-tagging the scene for every mesh/material/modifier added above
+    scene_objects = bpy.context.collection.objects
+    for mesh_obj in mesh_objects:
+        scene_objects.link(mesh_obj)
+    bpy.context.view_layer.update()
+    
     # Step 6: Merge body parts for seamless connections (order matters for proper merging)
     print("? Merging breast meshes with body...")
     _merge_breast_meshes_with_body(mesh_objects)
@@ -236,10 +276,14 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     except:
         print("? Could not set viewport mode (running headless)")
     
-    bpy.ops.object.select_all(action='DESELECT')
-    armature_obj.select_set(True)
-    for mesh_obj in mesh_objects:
-        mesh_obj.select_set(True)
+    # Gather the export set in its own collection and make it the active one, so the
+    # exporter reads it directly instead of needing a per-object selection pass
+    export_collection = bpy.data.collections.new("VF3_Export")
+    bpy.context.scene.collection.children.link(export_collection)
+    for obj in (armature_obj, *mesh_objects):
+        export_collection.objects.link(obj)
+    bpy.context.view_layer.active_layer_collection = \
+        bpy.context.view_layer.layer_collection.children[export_collection.name]
     
     bpy.context.view_layer.objects.active = armature_obj
     
@@ -253,16 +297,20 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     
     # Step 8: Export to glTF
     print(f"? Exporting to {output_path}...")
+    # Only ask the exporter for vertex colours when some mesh actually carries them
+    has_vertex_colors = any(getattr(obj.data, 'color_attributes', None) for obj in mesh_objects)
     try:
         bpy.ops.export_scene.gltf(
             filepath=output_path,
             check_existing=False,
             export_format='GLB',
-            use_selection=True,
-            export_apply=True,
+            use_active_collection=True,
+            export_apply=False,  # Only the Armature modifier exists and skinning exports it
             export_yup=True,
+            export_tangents=False,
             export_materials='EXPORT',
-            export_colors=True,
+            export_image_format='AUTO',  # Keep packed PNG/BMP data without re-encoding
+            export_colors=has_vertex_colors,
             export_cameras=False,
             export_extras=False,
             export_lights=False,
@@ -273,16 +321,206 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
             export_animations=False
         )
         print(f"? Export completed successfully: {output_path}")
+        if quantize:
+            _quantize_glb_with_gltfpack(output_path)
         return True
     except Exception as e:
         print(f"? Export failed: {e}")
         return False
 
 
-def assign_uv_coordinates(blender_mesh, trimesh_mesh, mesh_info, mesh_name):
+def _fill_mesh_from_arrays(blender_mesh, vertices, faces):
+    """Fill an empty Blender mesh from (V, 3) vertex and (F, k) face arrays.
+    
+    Bulk foreach_set equivalent of from_pydata(vertices.tolist(), [], faces.tolist()).
+    """
+    import bpy
+    import numpy as np
+    
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+    faces = np.ascontiguousarray(faces, dtype=np.int32)
+    face_count = len(faces)
+    corners = faces.shape[1] if face_count else 3
+    
+    blender_mesh.vertices.add(len(vertices))
+    blender_mesh.vertices.foreach_set("co", vertices.ravel())
+    
+    blender_mesh.loops.add(face_count * corners)
+    blender_mesh.loops.foreach_set("vertex_index", faces.ravel())
+    
+    blender_mesh.polygons.add(face_count)
+    blender_mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * corners, corners, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Blender 4.0+ derives loop_total from loop_start and makes it read-only
+        blender_mesh.polygons.foreach_set("loop_total", np.full(face_count, corners, dtype=np.int32))
+    
+    blender_mesh.update(calc_edges=True)
+
+
+def _faces_need_validation(faces, vertex_count):
+    """Check a (F, k) face array for anything mesh.validate() would have to repair.
+    
+    Looks for out-of-range corners, faces that repeat a vertex and duplicate
+    faces (the same vertex set in any winding, which validate() removes);
+    validate() is skipped only when none of these are present.
+    """
+    import numpy as np
+    
+    faces = np.asarray(faces)
+    if not len(faces):
+        return False
+    if faces.min() < 0 or faces.max() >= vertex_count:
+        return True
+    sorted_corners = np.sort(faces, axis=1)
+    if (sorted_corners[:, 1:] == sorted_corners[:, :-1]).any():
+        return True
+    return np.unique(sorted_corners, axis=0).shape[0] != len(faces)
+
+
+def _weld_vertices(vertices, faces, merge_distance: float = 1e-4):
+    """Merge vertices that lie within `merge_distance` of an earlier kept vertex.
+    
+    NumPy stand-in for bmesh.ops.remove_doubles(dist=merge_distance): pairs
+    come from a uniform grid (see _build_snap_grid) and each vertex merges
+    into its nearest earlier vertex that was itself kept. Kept vertices stay
+    in first-occurrence order and faces that collapse onto a repeated vertex
+    are dropped, as remove_doubles does.
+    
+    Returns (vertices, faces, loop_uv_indices, kept_indices). loop_uv_indices
+    holds the original vertex index of every face corner and kept_indices the
+    original index of every kept vertex (both None when nothing merged).
+    """
+    import numpy as np
+    
+    vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int32)
+    if len(vertices) < 2:
+        return vertices, faces, None, None
+    
+    grid = _build_snap_grid(vertices, merge_distance)
+    pair_rows, pair_points, dist_sq = _grid_pairs_within(grid, vertices, merge_distance)
+    earlier = pair_points < pair_rows
+    if not earlier.any():
+        return vertices, faces, None, None
+    pair_rows, pair_points, dist_sq = pair_rows[earlier], pair_points[earlier], dist_sq[earlier]
+    
+    # Only vertices with an earlier neighbour are visited, in index order and nearest
+    # neighbour first, so every merge target is already known to be kept
+    target = list(range(len(vertices)))
+    by_row = np.lexsort((dist_sq, pair_rows))
+    for row, point in zip(pair_rows[by_row].tolist(), pair_points[by_row].tolist()):
+        if target[row] == row and target[point] == point:
+            target[row] = point
+    target = np.asarray(target, dtype=np.intp)
+    kept = target == np.arange(len(vertices))
+    if kept.all():
+        return vertices, faces, None, None
+    
+    # Renumber kept vertices in first-occurrence order
+    remap = (np.cumsum(kept) - 1)[target].astype(np.int32)
+    welded_faces = remap[faces]
+    # A face is degenerate once any two of its corners share a vertex
+    sorted_corners = np.sort(welded_faces, axis=1)
+    keep = (sorted_corners[:, 1:] != sorted_corners[:, :-1]).all(axis=1)
+    kept_indices = np.flatnonzero(kept)
+    return vertices[kept_indices], welded_faces[keep], faces[keep].ravel(), kept_indices
+
+
+def _grid_cell_keys(cells, dims):
+    """Flatten (N, 3) non-negative grid cell coordinates into one int64 key per cell."""
+    return (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+
+def _build_snap_grid(points, cell_size: float):
+    """Bucket points into a uniform grid of `cell_size` cells for fixed-radius lookups.
+    
+    With cell_size equal to the search radius every neighbour within range sits
+    in the 27 cells around a query point. Returns None for an empty point set.
+    """
+    import numpy as np
+    
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return None
+    
+    cells = np.floor(points / cell_size).astype(np.int64)
+    # Two spare cells on each side so queries one cell outside the data never wrap around
+    low = cells.min(axis=0) - 2
+    dims = cells.max(axis=0) - low + 3
+    keys = _grid_cell_keys(cells - low, dims)
+    order = np.argsort(keys, kind='stable')
+    return points, cell_size, low, dims, keys[order], order
+
+
+def _grid_pairs_within(grid, candidates, max_distance: float):
+    """Every (candidate, grid point) pair closer than max_distance.
+    
+    All candidates are answered together: every neighbouring cell is a
+    searchsorted range, so there is no per-vertex Python call. Returns
+    (candidate_indices, point_indices, squared_distances).
+    """
+    import numpy as np
+    
+    candidates = np.asarray(candidates, dtype=np.float64).reshape(-1, 3)
+    no_pairs = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64))
+    if grid is None or len(candidates) == 0:
+        return no_pairs
+    points, cell_size, low, dims, sorted_keys, order = grid
+    
+    rel_cells = np.floor(candidates / cell_size).astype(np.int64) - low
+    # Candidates more than one cell outside the data have no neighbours in range
+    in_range = np.all((rel_cells >= 1) & (rel_cells <= dims - 2), axis=1)
+    query_rows = np.flatnonzero(in_range)
+    rel_cells = rel_cells[in_range]
+    
+    pair_rows = []
+    pair_points = []
+    for offset in np.indices((3, 3, 3)).reshape(3, -1).T - 1:
+        keys = _grid_cell_keys(rel_cells + offset, dims)
+        starts = np.searchsorted(sorted_keys, keys, side='left')
+        counts = np.searchsorted(sorted_keys, keys, side='right') - starts
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        rows = np.repeat(query_rows, counts)
+        # Position of every pair inside its cell's run of sorted keys
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_rows.append(rows)
+        pair_points.append(order[np.repeat(starts, counts) + within])
+    
+    if not pair_rows:
+        return no_pairs
+    pair_rows = np.concatenate(pair_rows)
+    pair_points = np.concatenate(pair_points)
+    diff = candidates[pair_rows] - points[pair_points]
+    dist_sq = np.einsum('ij,ij->i', diff, diff)
+    close = dist_sq <= max_distance * max_distance
+    return pair_rows[close], pair_points[close], dist_sq[close]
+
+
+def _find_nearest_in_grid(grid, candidates, max_distance: float):
+    """Index of the nearest grid point within max_distance of each candidate (-1 if none)."""
+    import numpy as np
+    
+    nearest = np.full(len(candidates), -1, dtype=np.intp)
+    pair_rows, pair_points, dist_sq = _grid_pairs_within(grid, candidates, max_distance)
+    if len(pair_rows) == 0:
+        return nearest
+    
+    # Closest pair per candidate: sort by (row, distance) and keep each row's first entry
+    by_row = np.lexsort((dist_sq, pair_rows))
+    first = by_row[np.r_[True, pair_rows[by_row][1:] != pair_rows[by_row][:-1]]]
+    nearest[pair_rows[first]] = pair_points[first]
+    return nearest
+
+
+def assign_uv_coordinates(blender_mesh, trimesh_mesh, mesh_info, mesh_name, loop_uv_indices=None):
     """
     Assign UV coordinates using the WORKING approach from export_ciel_to_gltf.py
     Key insight: Don't overcomplicate it - just preserve the original UV coordinates!
+    
+    loop_uv_indices optionally gives the pre-weld vertex of every loop for the
+    per-vertex UV lookup (see _weld_vertices).
     """
     try:
         # Check for existing UV coordinates (same as working export_ciel_to_gltf.py)
@@ -296,52 +534,44 @@ def assign_uv_coordinates(blender_mesh, trimesh_mesh, mesh_info, mesh_name):
             blender_mesh.uv_layers.new(name="UVMap")
         uv_layer = blender_mesh.uv_layers.active.data
         
+        # Vertex index of every loop, fetched in one bulk copy
+        import numpy as np
+        loop_vertex_indices = np.empty(len(blender_mesh.loops), dtype=np.int32)
+        blender_mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+        
         if existing_uv is not None:
             # Apply UV coordinates - use simple per-vertex mapping like the working code
             print(f"  Applying {len(existing_uv)} UV coordinates to {mesh_name}")
             
-            loop_index = 0
-            for poly in blender_mesh.polygons:
-                for loop_idx in poly.loop_indices:
-                    vertex_idx = blender_mesh.loops[loop_idx].vertex_index
-                    
-                    # Use vertex index to get UV (most common case)
-                    if vertex_idx < len(existing_uv):
-                        u, v = existing_uv[vertex_idx]
-                        # Don't flip or modify - use original coordinates
-                        uv_layer[loop_index].uv = (u, v)
-                    else:
-                        # Fallback: wrap around
-                        uv_idx = vertex_idx % len(existing_uv)
-                        u, v = existing_uv[uv_idx]
-                        uv_layer[loop_index].uv = (u, v)
-                    
-                    loop_index += 1
+            # Use vertex index to get UV; indices past the end wrap around.
+            # Don't flip or modify - use original coordinates
+            existing_uv = np.asarray(existing_uv, dtype=np.float32)
+            uv_indices = loop_vertex_indices if loop_uv_indices is None else loop_uv_indices
+            loop_uvs = existing_uv[uv_indices % len(existing_uv)]
+            uv_layer.foreach_set("uv", loop_uvs.ravel())
             
             print(f"  ✅ Successfully applied UV coordinates to {mesh_name}")
         else:
             # Generate simple planar UV mapping as fallback (same as working code)
             print(f"  Generating simple UV mapping for {mesh_name}")
-            vertices = [v.co for v in blender_mesh.vertices]
-            if vertices:
-                bounds = [min(vertices, key=lambda v: v[i])[i] for i in range(3)] + \
-                        [max(vertices, key=lambda v: v[i])[i] for i in range(3)]
-                width = bounds[3] - bounds[0]
-                height = bounds[4] - bounds[1]
+            vertex_count = len(blender_mesh.vertices)
+            if vertex_count:
+                coords = np.empty(vertex_count * 3, dtype=np.float32)
+                blender_mesh.vertices.foreach_get("co", coords)
+                coords = coords.reshape(-1, 3)
+                mins = coords.min(axis=0)
+                maxs = coords.max(axis=0)
+                width = maxs[0] - mins[0]
+                height = maxs[1] - mins[1]
                 
-                loop_index = 0
-                for poly in blender_mesh.polygons:
-                    for loop_idx in poly.loop_indices:
-                        vertex_idx = blender_mesh.loops[loop_idx].vertex_index
-                        vertex = blender_mesh.vertices[vertex_idx]
-                        
-                        u = (vertex.co.x - bounds[0]) / width if width > 0 else 0.5
-                        v = (vertex.co.y - bounds[1]) / height if height > 0 else 0.5
-                        u = max(0.0, min(1.0, u))
-                        v = max(0.0, min(1.0, v))
-                        
-                        uv_layer[loop_index].uv = (u, v)
-                        loop_index += 1
+                vertex_uvs = np.full((vertex_count, 2), 0.5, dtype=np.float32)
+                if width > 0:
+                    vertex_uvs[:, 0] = (coords[:, 0] - mins[0]) / width
+                if height > 0:
+                    vertex_uvs[:, 1] = (coords[:, 1] - mins[1]) / height
+                np.clip(vertex_uvs, 0.0, 1.0, out=vertex_uvs)
+                
+                uv_layer.foreach_set("uv", vertex_uvs[loop_vertex_indices].ravel())
             
             print(f"  ✅ Generated simple UV mapping for {mesh_name}")
         
@@ -353,6 +583,7 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
     """Create Blender materials from VF3 material data."""
     try:
         import bpy
+        import numpy as np
         from mathutils import Vector
     except ImportError:
         print("  ERROR: bpy not available for material creation")
@@ -360,206 +591,217 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
     
     print(f"    Creating {len(materials)} materials for mesh")
     
-    # Always create materials, even if we don't have face material mapping
-    for i, material_data in enumerate(materials):
-        # Create Blender material
-        mat_name = f"Material_{i}"
-        if material_data.get('name'):
-            mat_name = material_data['name']
-        
-        print(f"    Material {i}: {mat_name}")
-        
-        blender_mat = bpy.data.materials.new(name=f"{mesh_obj.name}_{mat_name}")
-        blender_mat.use_nodes = True
-        nodes = blender_mat.node_tree.nodes
-        links = blender_mat.node_tree.links
-        
-        # Clear default nodes
-        nodes.clear()
-        
-        # Create principled BSDF
-        bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
-        
-        # Set material properties to reduce z-fighting
-        blender_mat.use_backface_culling = True  # Enable backface culling
-        blender_mat.blend_method = 'OPAQUE'      # Use opaque blending (no alpha issues)
-        
-        # Set material properties (will be overridden by texture if present)
-        diffuse_color = (0.8, 0.8, 0.8, 1.0)  # Default
-        if 'diffuse' in material_data:
-            diffuse = material_data['diffuse']
-            if len(diffuse) >= 3:
-                diffuse_color = (*diffuse[:3], 1.0)
-                print(f"      Diffuse: {diffuse_color}")
-        else:
-            print(f"      Diffuse: {diffuse_color} (default)")
-        
-        # Only set diffuse as base color if we don't have a texture
-        # Textures will override this connection
-        bsdf.inputs['Base Color'].default_value = diffuse_color
-        
-        if 'specular' in material_data:
-            specular = material_data['specular']
-            if len(specular) >= 3:
-                # Use specular intensity as metallic factor
-                metallic = sum(specular[:3]) / 3.0
-                bsdf.inputs['Metallic'].default_value = min(metallic, 1.0)
-                print(f"      Metallic: {metallic}")
-        
-        # Handle texture
-        # Try texture list from .X materials or resolved absolute paths
-        texture_path = None
-        if 'texture' in material_data and material_data['texture']:
-            texture_path = material_data['texture']
-        elif 'textures' in material_data and material_data['textures']:
-            # Use the first texture
-            texture_path = material_data['textures'][0]
-
-        if texture_path:
-            # Resolve relative texture path against mesh source directory, if needed
-            resolved_path = texture_path
-            if not os.path.isabs(resolved_path):
-                base_dir = None
-                if mesh_info and 'source_path' in mesh_info:
-                    base_dir = os.path.dirname(mesh_info['source_path'])
-                if base_dir:
-                    candidate = os.path.join(base_dir, resolved_path)
-                    if os.path.exists(candidate):
-                        resolved_path = candidate
-                    else:
-                        # Also try data root for character textures (e.g., data/stkface.bmp)
-                        fallback = _find_in_data_root(os.path.basename(resolved_path), mesh_info)
-                        if fallback:
-                            resolved_path = fallback
-            print(f"      Texture: {resolved_path}")
-            if os.path.exists(resolved_path):
-                # Create texture node and load image (packed) with optional black->alpha conversion, without writing files
-                tex_image = nodes.new(type='ShaderNodeTexImage')
-                try:
-                    # Hair textures (stkhair_t.bmp) should have black-as-alpha, face textures should not
-                    make_alpha = 'stkhair' in resolved_path.lower()
-                    img = _load_image_with_black_as_alpha(resolved_path, make_alpha=make_alpha)
-                    print(f"      Debug: make_alpha={make_alpha} for {os.path.basename(resolved_path)} on {mesh_obj.name}")
-                    tex_image.image = img
-                    # Set texture interpolation to Closest for sharp pixelated look like VF3
-                    tex_image.interpolation = 'Closest'
-                    print(f"      Debug: texture image loaded: {img.name}, size: {img.size[:]}")
-                    print(f"      Debug: tex_image.image assigned: {tex_image.image.name if tex_image.image else 'None'}")
+    # Hair meshes get black-as-alpha textures; decided once per mesh, not per material
+    is_hair_mesh = 'hair' in mesh_obj.name.lower()
+    
+    # Attachments that share an identical material set reuse the already-built
+    # Blender materials (materials are shareable between meshes)
+    cache_key = _material_set_key(materials, mesh_info, mesh_obj.name)
+    cached_materials = _MAT_CACHE.get(cache_key)
+    if cached_materials is not None:
+        try:
+            if all(mat.name in bpy.data.materials for mat in cached_materials):
+                print(f"    Reusing {len(cached_materials)} materials built for an identical material set")
+                for blender_mat in cached_materials:
+                    mesh_obj.data.materials.append(blender_mat)
+            else:
+                cached_materials = None
+        except ReferenceError:
+            cached_materials = None  # A material was removed from bpy.data
+    
+    if cached_materials is None:
+        built_materials = []
+        # Always create materials, even if we don't have face material mapping
+        for i, material_data in enumerate(materials):
+            # Create Blender material
+            mat_name = f"Material_{i}"
+            if material_data.get('name'):
+                mat_name = material_data['name']
+        
+            print(f"    Material {i}: {mat_name}")
+        
+            blender_mat = bpy.data.materials.new(name=f"{mesh_obj.name}_{mat_name}")
+            blender_mat.use_nodes = True
+            nodes = blender_mat.node_tree.nodes
+            links = blender_mat.node_tree.links
+        
+            # Clear default nodes
+            nodes.clear()
+        
+            # Create principled BSDF
+            bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+            output = nodes.new(type='ShaderNodeOutputMaterial')
+            links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+        
+            # Set material properties to reduce z-fighting
+            blender_mat.use_backface_culling = True  # Enable backface culling
+            blender_mat.blend_method = 'OPAQUE'      # Use opaque blending (no alpha issues)
+        
+            # Set material properties (will be overridden by texture if present)
+            diffuse_color = (0.8, 0.8, 0.8, 1.0)  # Default
+            if 'diffuse' in material_data:
+                diffuse = material_data['diffuse']
+                if len(diffuse) >= 3:
+                    diffuse_color = (*diffuse[:3], 1.0)
+                    print(f"      Diffuse: {diffuse_color}")
+            else:
+                print(f"      Diffuse: {diffuse_color} (default)")
+        
+            # Only set diffuse as base color if we don't have a texture
+            # Textures will override this connection
+            bsdf.inputs['Base Color'].default_value = diffuse_color
+        
+            if 'specular' in material_data:
+                specular = material_data['specular']
+                if len(specular) >= 3:
+                    # Use specular intensity as metallic factor
+                    metallic = sum(specular[:3]) / 3.0
+                    bsdf.inputs['Metallic'].default_value = min(metallic, 1.0)
+                    print(f"      Metallic: {metallic}")
+        
+            # Handle texture
+            # Try texture list from .X materials or resolved absolute paths
+            texture_path = None
+            if 'texture' in material_data and material_data['texture']:
+                texture_path = material_data['texture']
+            elif 'textures' in material_data and material_data['textures']:
+                # Use the first texture
+                texture_path = material_data['textures'][0]
+
+            if texture_path:
+                # Resolve relative texture path against mesh source directory, if needed
+                source_path = mesh_info.get('source_path') if mesh_info else None
+                resolved_path = _resolve_texture_path(texture_path, source_path)
+                print(f"      Texture: {resolved_path}")
+                if os.path.exists(resolved_path):
+                    # Create texture node and load image (packed) with optional black->alpha conversion, without writing files
+                    tex_image = nodes.new(type='ShaderNodeTexImage')
+                    try:
+                        # Hair textures (stkhair_t.bmp) should have black-as-alpha, face textures should not
+                        make_alpha = 'stkhair' in resolved_path.lower()
+                        img = _load_image_with_black_as_alpha(resolved_path, make_alpha=make_alpha)
+                        print(f"      Debug: make_alpha={make_alpha} for {os.path.basename(resolved_path)} on {mesh_obj.name}")
+                        tex_image.image = img
+                        # Set texture interpolation to Closest for sharp pixelated look like VF3
+                        tex_image.interpolation = 'Closest'
+                        print(f"      Debug: texture image loaded: {img.name}, size: {img.size[:]}")
+                        print(f"      Debug: tex_image.image assigned: {tex_image.image.name if tex_image.image else 'None'}")
                     
-                    # For textured materials, multiply texture with diffuse color (like VF3 does)
-                    if 'diffuse' in material_data and diffuse_color != (1.0, 1.0, 1.0, 1.0):
-                        # Create ColorMix node to multiply texture with diffuse color
-                        color_mix = nodes.new(type='ShaderNodeMix')
-                        color_mix.data_type = 'RGBA'
-                        color_mix.blend_type = 'MULTIPLY'
-                        color_mix.inputs['Fac'].default_value = 1.0
-                        color_mix.inputs['Color2'].default_value = diffuse_color
+                        # For textured materials, multiply texture with diffuse color (like VF3 does)
+                        if 'diffuse' in material_data and diffuse_color != (1.0, 1.0, 1.0, 1.0):
+                            # Create ColorMix node to multiply texture with diffuse color
+                            color_mix = nodes.new(type='ShaderNodeMix')
+                            color_mix.data_type = 'RGBA'
+                            color_mix.blend_type = 'MULTIPLY'
+                            color_mix.inputs['Fac'].default_value = 1.0
+                            color_mix.inputs['Color2'].default_value = diffuse_color
                         
-                        # Connect: Texture → ColorMix → Base Color
-                        links.new(tex_image.outputs['Color'], color_mix.inputs['Color1'])
-                        links.new(color_mix.outputs['Result'], bsdf.inputs['Base Color'])
-                        print(f"      Debug: Connected texture '{img.name}' via ColorMix to Base Color")
-                    else:
-                        # Pure texture, no color mixing needed
-                        links.new(tex_image.outputs['Color'], bsdf.inputs['Base Color'])
-                        print(f"      Debug: Connected texture '{img.name}' directly to Base Color")
-                    # Alpha hookup - only for hair textures
-                    if make_alpha:
-                        blender_mat.blend_method = 'CLIP'
-                        blender_mat.alpha_threshold = 0.1  # Lower threshold to avoid white edges
-                        blender_mat.shadow_method = 'CLIP'
-                        blender_mat.use_backface_culling = True  # Enable backface culling for hair
-                        print(f"      Debug: Set CLIP blend mode for hair texture")
-                    else:
-                        # Face textures should stay opaque
-                        blender_mat.blend_method = 'OPAQUE'
-                        print(f"      Debug: Set OPAQUE blend mode for face texture")
-                        # Check what alpha outputs are actually available
-                        alpha_output = None
-                        output_names = [s.name for s in tex_image.outputs]
-                        print(f"      Debug: Texture node outputs: {output_names}")
+                            # Connect: Texture → ColorMix → Base Color
+                            links.new(tex_image.outputs['Color'], color_mix.inputs['Color1'])
+                            links.new(color_mix.outputs['Result'], bsdf.inputs['Base Color'])
+                            print(f"      Debug: Connected texture '{img.name}' via ColorMix to Base Color")
+                        else:
+                            # Pure texture, no color mixing needed
+                            links.new(tex_image.outputs['Color'], bsdf.inputs['Base Color'])
+                            print(f"      Debug: Connected texture '{img.name}' directly to Base Color")
+                        # Alpha hookup - only for hair textures
+                        if make_alpha:
+                            blender_mat.blend_method = 'CLIP'
+                            blender_mat.alpha_threshold = 0.1  # Lower threshold to avoid white edges
+                            blender_mat.shadow_method = 'CLIP'
+                            blender_mat.use_backface_culling = True  # Enable backface culling for hair
+                            print(f"      Debug: Set CLIP blend mode for hair texture")
+                        else:
+                            # Face textures should stay opaque
+                            blender_mat.blend_method = 'OPAQUE'
+                            print(f"      Debug: Set OPAQUE blend mode for face texture")
+                            # Check what alpha outputs are actually available
+                            alpha_output = None
+                            output_names = [s.name for s in tex_image.outputs]
+                            print(f"      Debug: Texture node outputs: {output_names}")
                         
-                        for output_name in ['Alpha', 'alpha', 'A']:
-                            if output_name in output_names:
-                                alpha_output = output_name
-                                break
+                            for output_name in ['Alpha', 'alpha', 'A']:
+                                if output_name in output_names:
+                                    alpha_output = output_name
+                                    break
                         
-                        if alpha_output:
-                            links.new(tex_image.outputs[alpha_output], bsdf.inputs['Alpha'])
-                            print(f"      Debug: Connected {alpha_output} to BSDF Alpha")
-                        else:
-                            print(f"      Debug: No alpha output found in {output_names}")
-                    print(f"      ? Loaded texture (packed): {img.name}")
-                except Exception as e:
-                    print(f"      ? Failed to load texture: {resolved_path} - {e}")
+                            if alpha_output:
+                                links.new(tex_image.outputs[alpha_output], bsdf.inputs['Alpha'])
+                                print(f"      Debug: Connected {alpha_output} to BSDF Alpha")
+                            else:
+                                print(f"      Debug: No alpha output found in {output_names}")
+                        print(f"      ? Loaded texture (packed): {img.name}")
+                    except Exception as e:
+                        print(f"      ? Failed to load texture: {resolved_path} - {e}")
+                else:
+                    print(f"      ? Texture file not found: {resolved_path}")
             else:
-                print(f"      ? Texture file not found: {resolved_path}")
-        else:
-            # Try to auto-discover textures near mesh
-            auto_tex = _auto_discover_texture(mesh_info, mesh_obj.name)
-            if auto_tex and os.path.exists(auto_tex):
-                print(f"      ? Auto texture: {auto_tex}")
-                tex_image = nodes.new(type='ShaderNodeTexImage')
-                try:
-                    # Face textures should NOT have black-as-alpha, only hair textures should
-                    make_alpha = 'hair' in mesh_obj.name.lower() and 'stkhair' in auto_tex.lower()
-                    img = _load_image_with_black_as_alpha(auto_tex, make_alpha=make_alpha)
-                    print(f"      Debug: make_alpha={make_alpha} for {os.path.basename(auto_tex)} on {mesh_obj.name}")
-                    tex_image.image = img
-                    # Set texture interpolation to Closest for sharp pixelated look like VF3
-                    tex_image.interpolation = 'Closest'
+                # Try to auto-discover textures near mesh
+                auto_tex = _auto_discover_texture(mesh_info, mesh_obj.name)
+                if auto_tex and os.path.exists(auto_tex):
+                    print(f"      ? Auto texture: {auto_tex}")
+                    tex_image = nodes.new(type='ShaderNodeTexImage')
+                    try:
+                        # Face textures should NOT have black-as-alpha, only hair textures should
+                        make_alpha = is_hair_mesh and 'stkhair' in auto_tex.lower()
+                        img = _load_image_with_black_as_alpha(auto_tex, make_alpha=make_alpha)
+                        print(f"      Debug: make_alpha={make_alpha} for {os.path.basename(auto_tex)} on {mesh_obj.name}")
+                        tex_image.image = img
+                        # Set texture interpolation to Closest for sharp pixelated look like VF3
+                        tex_image.interpolation = 'Closest'
                     
-                    # For textured materials, multiply texture with diffuse color (like VF3 does)
-                    if 'diffuse' in material_data and diffuse_color != (1.0, 1.0, 1.0, 1.0):
-                        # Create ColorMix node to multiply texture with diffuse color
-                        color_mix = nodes.new(type='ShaderNodeMix')
-                        color_mix.data_type = 'RGBA'
-                        color_mix.blend_type = 'MULTIPLY'
-                        color_mix.inputs['Fac'].default_value = 1.0
-                        color_mix.inputs['Color2'].default_value = diffuse_color
+                        # For textured materials, multiply texture with diffuse color (like VF3 does)
+                        if 'diffuse' in material_data and diffuse_color != (1.0, 1.0, 1.0, 1.0):
+                            # Create ColorMix node to multiply texture with diffuse color
+                            color_mix = nodes.new(type='ShaderNodeMix')
+                            color_mix.data_type = 'RGBA'
+                            color_mix.blend_type = 'MULTIPLY'
+                            color_mix.inputs['Fac'].default_value = 1.0
+                            color_mix.inputs['Color2'].default_value = diffuse_color
                         
-                        # Connect: Texture → ColorMix → Base Color
-                        links.new(tex_image.outputs['Color'], color_mix.inputs['Color1'])
-                        links.new(color_mix.outputs['Result'], bsdf.inputs['Base Color'])
-                        print(f"      Debug: Connected texture '{img.name}' via ColorMix to Base Color")
-                    else:
-                        # Pure texture, no color mixing needed
-                        links.new(tex_image.outputs['Color'], bsdf.inputs['Base Color'])
-                        print(f"      Debug: Connected texture '{img.name}' directly to Base Color")
-                    if make_alpha and 'hair' in mesh_obj.name.lower():
-                        blender_mat.blend_method = 'CLIP'
-                        blender_mat.alpha_threshold = 0.1  # Lower threshold to avoid white edges
-                        blender_mat.shadow_method = 'CLIP'
-                        blender_mat.use_backface_culling = True  # Enable backface culling for hair
-                        print(f"      Debug: Set CLIP blend mode for hair texture")
-                    else:
-                        # Face textures should stay opaque
-                        blender_mat.blend_method = 'OPAQUE'
-                        print(f"      Debug: Set OPAQUE blend mode for face texture")
-                        # Check what alpha outputs are actually available
-                        alpha_output = None
-                        output_names = [s.name for s in tex_image.outputs]
-                        print(f"      Debug: Texture node outputs: {output_names}")
+                            # Connect: Texture → ColorMix → Base Color
+                            links.new(tex_image.outputs['Color'], color_mix.inputs['Color1'])
+                            links.new(color_mix.outputs['Result'], bsdf.inputs['Base Color'])
+                            print(f"      Debug: Connected texture '{img.name}' via ColorMix to Base Color")
+                        else:
+                            # Pure texture, no color mixing needed
+                            links.new(tex_image.outputs['Color'], bsdf.inputs['Base Color'])
+                            print(f"      Debug: Connected texture '{img.name}' directly to Base Color")
+                        if make_alpha and is_hair_mesh:
+                            blender_mat.blend_method = 'CLIP'
+                            blender_mat.alpha_threshold = 0.1  # Lower threshold to avoid white edges
+                            blender_mat.shadow_method = 'CLIP'
+                            blender_mat.use_backface_culling = True  # Enable backface culling for hair
+                            print(f"      Debug: Set CLIP blend mode for hair texture")
+                        else:
+                            # Face textures should stay opaque
+                            blender_mat.blend_method = 'OPAQUE'
+                            print(f"      Debug: Set OPAQUE blend mode for face texture")
+                            # Check what alpha outputs are actually available
+                            alpha_output = None
+                            output_names = [s.name for s in tex_image.outputs]
+                            print(f"      Debug: Texture node outputs: {output_names}")
                         
-                        for output_name in ['Alpha', 'alpha', 'A']:
-                            if output_name in output_names:
-                                alpha_output = output_name
-                                break
+                            for output_name in ['Alpha', 'alpha', 'A']:
+                                if output_name in output_names:
+                                    alpha_output = output_name
+                                    break
                         
-                        if alpha_output:
-                            links.new(tex_image.outputs[alpha_output], bsdf.inputs['Alpha'])
-                            print(f"      Debug: Connected {alpha_output} to BSDF Alpha")
-                        else:
-                            print(f"      Debug: No alpha output found in {output_names}")
-                    print(f"      ? Loaded texture (packed): {img.name}")
-                except Exception as e:
-                    print(f"      ? Failed to load texture: {auto_tex} - {e}")
+                            if alpha_output:
+                                links.new(tex_image.outputs[alpha_output], bsdf.inputs['Alpha'])
+                                print(f"      Debug: Connected {alpha_output} to BSDF Alpha")
+                            else:
+                                print(f"      Debug: No alpha output found in {output_names}")
+                        print(f"      ? Loaded texture (packed): {img.name}")
+                    except Exception as e:
+                        print(f"      ? Failed to load texture: {auto_tex} - {e}")
         
-        # Add material to mesh
-        mesh_obj.data.materials.append(blender_mat)
-        print(f"      ? Added material {mat_name} to mesh")
+            # Add material to mesh
+            mesh_obj.data.materials.append(blender_mat)
+            built_materials.append(blender_mat)
+            print(f"      ? Added material {mat_name} to mesh")
+    
+        _MAT_CACHE[cache_key] = built_materials
     
     # Try to assign face materials if available
     face_materials = None
@@ -596,15 +838,19 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
     if face_materials is not None and len(face_materials) > 0:
         print(f"    Assigning face materials: {len(face_materials)} face assignments to {len(mesh_obj.data.polygons)} polygons")
         
-        mesh_obj.data.update()
-        if len(mesh_obj.data.polygons) > 0:
-            assigned_count = 0
-            material_usage = {}
-            for face_idx, mat_idx in enumerate(face_materials):
-                if face_idx < len(mesh_obj.data.polygons) and mat_idx < len(materials):
-                    mesh_obj.data.polygons[face_idx].material_index = mat_idx
-                    assigned_count += 1
-                    material_usage[mat_idx] = material_usage.get(mat_idx, 0) + 1
+        polygons = mesh_obj.data.polygons
+        if len(polygons) > 0:
+            # Read current indices, overwrite the valid assignments, write back in one call
+            material_indices = np.zeros(len(polygons), dtype=np.int32)
+            polygons.foreach_get("material_index", material_indices)
+            fm = np.asarray(face_materials, dtype=np.int64)[:len(polygons)]
+            valid = fm < len(materials)
+            material_indices[:len(fm)][valid] = fm[valid]
+            polygons.foreach_set("material_index", material_indices)
+            
+            assigned_count = int(valid.sum())
+            used, counts = np.unique(fm[valid], return_counts=True)
+            material_usage = dict(zip(used.tolist(), counts.tolist()))
             print(f"    ? Assigned materials to {assigned_count}/{len(face_materials)} faces")
             if 'head' in mesh_obj.name.lower():
                 print(f"    Debug: Material usage for {mesh_obj.name}: {material_usage}")
@@ -612,6 +858,40 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
         print("    ? No face material mapping found - all faces will use first material (white)")
 
 
+def _material_set_key(materials: List, mesh_info: dict, mesh_name: str) -> tuple:
+    """Hashable identity of everything _create_blender_materials reads to build a material set."""
+    def as_tuple(value):
+        return tuple(value) if value is not None else None
+    
+    source_dir = os.path.dirname(mesh_info['source_path']) if mesh_info and 'source_path' in mesh_info else None
+    entries = []
+    needs_auto_texture = False
+    for material_data in materials:
+        texture = material_data.get('texture') or (material_data.get('textures') or [None])[0]
+        needs_auto_texture = needs_auto_texture or not texture
+        entries.append((material_data.get('name'), as_tuple(material_data.get('diffuse')),
+                        as_tuple(material_data.get('specular')), texture))
+    # Untextured materials fall back to a texture picked by mesh name
+    auto_texture = _auto_discover_texture(mesh_info, mesh_name) if needs_auto_texture else None
+    return (tuple(entries), source_dir, 'hair' in mesh_name.lower(), auto_texture)
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_texture_path(texture_path: str, source_path: str = None) -> str:
+    """Resolve a material texture against the mesh source directory, then the data root."""
+    if os.path.isabs(texture_path):
+        return texture_path
+    base_dir = os.path.dirname(source_path) if source_path else None
+    if not base_dir:
+        return texture_path
+    candidate = os.path.join(base_dir, texture_path)
+    if os.path.exists(candidate):
+        return candidate
+    # Also try data root for character textures (e.g., data/stkface.bmp)
+    fallback = _find_in_data_root(os.path.basename(texture_path), {'source_path': source_path})
+    return fallback or texture_path
+
+
 def _find_in_data_root(filename: str, mesh_info: dict) -> str:
     try:
         # Ascend until a directory named 'data' is found
@@ -629,17 +909,36 @@ def _find_in_data_root(filename: str, mesh_info: dict) -> str:
         candidate = os.path.join(data_dir, filename)
         if os.path.exists(candidate):
             return candidate
-        # Recursive search case-insensitive
-        target = filename.lower()
-        for root, _dirs, files in os.walk(data_dir):
-            for fn in files:
-                if fn.lower() == target:
-                    return os.path.join(root, fn)
-        return ''
+        # Recursive search case-insensitive (tree is walked once per data dir)
+        return _index_data_dir(data_dir).get(filename.lower(), '')
     except Exception:
         return ''
 
 
+@functools.lru_cache(maxsize=32)
+def _index_data_dir(data_dir: str, lowercase: bool = True) -> Dict[str, str]:
+    """Map filename -> full path for every file under data_dir (first walk hit wins).
+    
+    Names are lowercased for case-insensitive lookups unless lowercase=False.
+    """
+    index = {}
+    for root, _dirs, files in os.walk(data_dir):
+        for fn in files:
+            index.setdefault(fn.lower() if lowercase else fn, os.path.join(root, fn))
+    return index
+
+
+# Texture file extensions and the name keywords _auto_discover_texture favours
+_TEXTURE_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.tga')
+_TEXTURE_NAME_PRIORITIES = ('hair', 'face', 'head', 'skin')
+
+
+@functools.lru_cache(maxsize=64)
+def _list_texture_files(base_dir: str) -> Tuple[str, ...]:
+    """Image files directly inside base_dir (listed once per directory)."""
+    return tuple(fn for fn in os.listdir(base_dir) if fn.lower().endswith(_TEXTURE_EXTS))
+
+
 def _auto_discover_texture(mesh_info: dict, mesh_name: str) -> str:
     try:
         if not mesh_info or 'source_path' not in mesh_info:
@@ -648,128 +947,154 @@ def _auto_discover_texture(mesh_info: dict, mesh_name: str) -> str:
         if not os.path.isdir(base_dir):
             return ''
         # Prioritize likely names
-        priorities = ['hair', 'face', 'head', 'skin']
-        exts = ['.png', '.jpg', '.jpeg', '.bmp', '.tga']
+        mesh_tokens = [token for token in mesh_name.lower().split('_') if token]
         candidates = []
-        for fn in os.listdir(base_dir):
+        for fn in _list_texture_files(base_dir):
             lower = fn.lower()
-            if any(lower.endswith(e) for e in exts):
-                # Score by priority keyword and mesh name overlap
-                score = 0
-                for p in priorities:
-                    if p in lower:
-                        score += 10
-                for token in mesh_name.lower().split('_'):
-                    if token and token in lower:
-                        score += 1
-                candidates.append((score, os.path.join(base_dir, fn)))
-        if not candidates:
-            return ''
-        candidates.sort(reverse=True)
-        return candidates[0][1]
+            # Score by priority keyword and mesh name overlap
+            score = 0
+            for p in _TEXTURE_NAME_PRIORITIES:
+                if p in lower:
+                    score += 10
+            for token in mesh_tokens:
+                if token in lower:
+                    score += 1
+            candidates.append((score, os.path.join(base_dir, fn)))
+        # Highest (score, path) wins, as the old reverse sort's first entry did
+        return max(candidates)[1] if candidates else ''
     except Exception:
         return ''
 
 
-def _ensure_alpha_from_black(image_path: str) -> str:
-    """If image lacks alpha (e.g., BMP), generate a PNG with alpha where near-black becomes transparent."""
-    try:
-        import bpy
-        # Load
-        img = bpy.data.images.load(image_path)
-        # If already has alpha data that isn't fully opaque, keep
-        has_alpha = img.channels == 4
-        if has_alpha:
-            # Inspect a small sample
-            px = list(img.pixels)
-            if any(px[i+3] < 0.999 for i in range(0, min(len(px), 4000), 4)):
-                return image_path
-        # Ensure 4 channels
-        if img.channels < 4:
-            img.colorspace_settings.name = 'sRGB'
-        # Build alpha from black threshold - be more aggressive for hair textures
-        px = list(img.pixels)  # RGBA floats 0..1
-        n = len(px)
-        # Use gentler threshold for hair to avoid white sheen
-        threshold = 0.05 if make_alpha else 0.05  # Same threshold for both
-        for i in range(0, n, 4):
-            r, g, b, a = px[i], px[i+1], px[i+2], 1.0
-            # Near-black threshold - higher for hair textures
-            if r < threshold and g < threshold and b < threshold:
-                a = 0.0
-            px[i], px[i+1], px[i+2], px[i+3] = r, g, b, a
-        img.pixels[:] = px
-        # Save as PNG next to source
-        base_dir = os.path.dirname(image_path)
-        base_name = os.path.splitext(os.path.basename(image_path))[0]
-        out_path = os.path.join(base_dir, f"{base_name}_alpha.png")
-        img.filepath_raw = out_path
-        img.file_format = 'PNG'
-        img.save()
-        return out_path if os.path.exists(out_path) else image_path
-    except Exception:
-        return image_path
+def _pil_decode_and_mask(image_path: str, make_alpha: bool) -> Optional[Tuple[int, int, bool, 'np.ndarray']]:
+    """Decode an image with PIL into Blender's flat float32 RGBA pixel layout.
+    
+    Pure PIL/numpy (no bpy), so it is safe to run on worker threads.
+    Returns (width, height, has_alpha, pixels), or None for opaque images that
+    need no masking - those are loaded by Blender itself (file-backed, Blender's
+    bottom-up row order), as they always have been.
+    """
+    from PIL import Image
+    import numpy as np
+    
+    # Use PIL to load and process the image (same as original script); open() only
+    # reads the header, so opaque images cost nothing here
+    pil_img = Image.open(image_path)
+    has_alpha = make_alpha or pil_img.mode == 'RGBA'
+    if not has_alpha:
+        return None
+    if pil_img.mode != 'RGBA':
+        pil_img = pil_img.convert('RGBA')
+    width, height = pil_img.size
+    
+    # Blender images always store RGBA, so read PIL's uint8 RGBA buffer as-is (read-only,
+    # never written to)
+    data = np.asarray(pil_img)
+    
+    # Normalize to 0-1 into one contiguous float32 buffer (no Y flip to match original);
+    # the only full-size allocation on this path
+    pixels = np.empty(data.size, dtype=np.float32)
+    np.multiply(data, np.float32(1.0 / 255.0), out=pixels.reshape(data.shape))
+    
+    # Handle black-as-alpha transparency (from original script), written straight into
+    # the float buffer so the uint8 data never needs a writable copy
+    if make_alpha:
+        # Check for pixels that are very close to black (RGB < 5) - gentler to avoid white sheen
+        black_mask = (data[:, :, :3] < 5).all(axis=2)
+        # Set alpha to 0 for black pixels
+        pixels.reshape(-1, 4)[black_mask.ravel(), 3] = 0.0
+    return width, height, has_alpha, pixels
+
+
+def _predecode_textures(attachments: List, mesh_data: Dict[str, Any]) -> int:
+    """Decode every explicitly referenced texture on a thread pool before material creation.
+    
+    Only PIL/numpy work runs off the main thread; the Blender images are still
+    created in _load_image_with_black_as_alpha, which picks results up from
+    _DECODED_IMAGES. Returns the number of images decoded.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    jobs = {}
+    for att in attachments:
+        mesh_info = mesh_data.get(att.resource_id)
+        if not mesh_info or not mesh_info.get('materials'):
+            continue
+        source_path = mesh_info.get('source_path')
+        for material_data in mesh_info['materials']:
+            texture = material_data.get('texture') or (material_data.get('textures') or [None])[0]
+            if not texture:
+                continue
+            path = _resolve_texture_path(texture, source_path)
+            if not os.path.exists(path):
+                continue
+            # Same make_alpha rule and cache key as _create_blender_materials/_load_image_with_black_as_alpha
+            make_alpha = 'stkhair' in path.lower()
+            key = (os.path.realpath(path), make_alpha)
+            if key not in _IMG_CACHE and key not in _DECODED_IMAGES:
+                jobs[key] = path
+    
+    if len(jobs) < 2:
+        return 0  # Nothing to overlap; decode lazily on the main thread
+    
+    def decode(item):
+        key, path = item
+        try:
+            return key, _pil_decode_and_mask(path, key[1])
+        except Exception:
+            return key, None  # Fall back to the main-thread path and its error handling
+    
+    decoded_count = 0
+    with ThreadPoolExecutor() as executor:
+        for key, decoded in executor.map(decode, jobs.items()):
+            if decoded is not None:
+                _DECODED_IMAGES[key] = decoded
+                decoded_count += 1
+    return decoded_count
 
 
 def _load_image_with_black_as_alpha(image_path: str, make_alpha: bool) -> 'bpy.types.Image':
     """Load image with proper black-as-alpha processing using PIL approach from original script."""
     import bpy
     
+    # Short-circuit before PIL touches the file when this exact processing was done already
+    cache_key = (os.path.realpath(image_path), bool(make_alpha))
+    cached_img = _IMG_CACHE.get(cache_key)
+    if cached_img is not None:
+        try:
+            if cached_img.name in bpy.data.images:
+                return cached_img
+        except ReferenceError:
+            pass  # Image was removed from bpy.data
+        del _IMG_CACHE[cache_key]
+    
     try:
-        from PIL import Image
-        import numpy as np
-        
         # Check if image already loaded in Blender to avoid duplicates
         img_name = os.path.basename(image_path)
         existing_img = bpy.data.images.get(img_name)
         if existing_img:
             print(f"      ? Reusing existing image: {img_name}")
+            _IMG_CACHE[cache_key] = existing_img
             return existing_img
         
-        # Use PIL to load and process the image (same as original script)
-        pil_img = Image.open(image_path)
-        
-        # Handle black-as-alpha transparency (from original script)
-        if make_alpha:
-            # Convert to RGBA if needed
-            if pil_img.mode != 'RGBA':
-                pil_img = pil_img.convert('RGBA')
-            
-            # Create alpha channel based on black pixels
-            data = np.array(pil_img)
-            # Check for pixels that are very close to black (RGB < 5) - gentler to avoid white sheen
-            black_mask = np.all(data[:, :, :3] < 5, axis=2)
-            # Set alpha to 0 for black pixels
-            data[black_mask, 3] = 0
-            
-            # Update image with alpha channel
-            pil_img = Image.fromarray(data, 'RGBA')
-        
-        # Convert PIL image to Blender image
-        width, height = pil_img.size
+        # Use pixels decoded ahead of time by _predecode_textures, else decode now
+        decoded = _DECODED_IMAGES.pop(cache_key, None)
+        if decoded is None:
+            decoded = _pil_decode_and_mask(image_path, make_alpha)
+        if decoded is None:
+            # Opaque image with no black-as-alpha mask - let Blender load the file directly
+            img = bpy.data.images.load(image_path)
+            img.pack()
+            print(f"      ? Loaded texture with Blender: {img_name}")
+            _IMG_CACHE[cache_key] = img
+            return img
+        width, height, has_alpha, pixels = decoded
         
         # Create new Blender image with alpha if needed
-        has_alpha = make_alpha or pil_img.mode == 'RGBA'
         blender_img = bpy.data.images.new(name=img_name, width=width, height=height, alpha=has_alpha)
         
-        # Convert PIL image to Blender pixel format
-        if has_alpha:
-            # RGBA format
-            if pil_img.mode != 'RGBA':
-                pil_img = pil_img.convert('RGBA')
-            pixels = np.array(pil_img).astype(np.float32) / 255.0  # Convert to 0-1 range
-            # Blender expects flattened RGBA (no Y flip to match original)
-            pixels = pixels.flatten()
-        else:
-            # RGB format
-            if pil_img.mode != 'RGB':
-                pil_img = pil_img.convert('RGB')
-            pixels = np.array(pil_img).astype(np.float32) / 255.0  # Convert to 0-1 range
-            # Blender expects flattened RGB (no Y flip to match original)
-            pixels = pixels.flatten()
-        
-        # Assign pixels to Blender image
-        blender_img.pixels[:] = pixels
+        # Assign pixels to Blender image in one bulk write
+        blender_img.pixels.foreach_set(pixels)
         
         # Update image to ensure changes are applied
         blender_img.update()
@@ -778,6 +1103,7 @@ def _load_image_with_black_as_alpha(image_path: str, make_alpha: bool) -> 'bpy.t
         blender_img.pack()
         
         print(f"      ? Processed texture with PIL: {img_name} ({'RGBA' if has_alpha else 'RGB'})")
+        _IMG_CACHE[cache_key] = blender_img
         return blender_img
         
     except ImportError:
@@ -785,12 +1111,14 @@ def _load_image_with_black_as_alpha(image_path: str, make_alpha: bool) -> 'bpy.t
         # Fallback to direct Blender loading
         img = bpy.data.images.load(image_path)
         img.pack()
+        _IMG_CACHE[cache_key] = img
         return img
     except Exception as e:
         print(f"      ? Failed to process texture with PIL: {e}, falling back to direct loading")
         # Fallback to direct Blender loading
         img = bpy.data.images.load(image_path)
         img.pack()
+        _IMG_CACHE[cache_key] = img
         return img
 
 
@@ -807,67 +1135,94 @@ def process_vf3_dynamic_visual_faces(vertices, vertex_bones, faces, dyn_idx, wor
     
     print(f"    VF3-accurate processing: {len(vertices)} vertices, {len(faces)} faces, {len(set(vertex_bones))} unique bones")
     
-    # Group vertices by bone (like VF3 does)
-    bone_vertex_groups = {}
-    for v_idx, (vertex_tuple, bone_name) in enumerate(zip(vertices, vertex_bones)):
-        if bone_name not in bone_vertex_groups:
-            bone_vertex_groups[bone_name] = {
-                'vertices': [],
-                'vertex_indices': [],
-                'bone': bone_name
-            }
-        bone_vertex_groups[bone_name]['vertices'].append(vertex_tuple)
-        bone_vertex_groups[bone_name]['vertex_indices'].append(v_idx)
+    # Vertex positions as one (N, 3) pos1 column instead of per-vertex (pos1, pos2) tuples;
+    # everything below works on vertex indices into it
+    pos1_all = np.array([vertex_tuple[0] for vertex_tuple in vertices], dtype=np.float64).reshape(-1, 3)
+    vertex_bones_count = len(vertex_bones)
+    
+    # Group vertices by bone (like VF3 does): np.unique gives every vertex its bone's
+    # slot, re-ranked by first appearance so groups keep the original bone order
+    grouped_bones = np.asarray(vertex_bones[:len(vertices)], dtype=str)
+    unique_bones, first_seen, bone_inverse = np.unique(grouped_bones, return_index=True, return_inverse=True)
+    seen_order = np.argsort(first_seen, kind='stable')
+    group_rank = np.empty(len(seen_order), dtype=np.int32)
+    group_rank[seen_order] = np.arange(len(seen_order), dtype=np.int32)
+    group_bone_names = unique_bones[seen_order].tolist()
     
-    print(f"    VF3 bone groups: {list(bone_vertex_groups.keys())}")
+    print(f"    VF3 bone groups: {group_bone_names}")
     
     # Create one connector per bone (like original VF3) - this fixes missing faces issue
     connectors_created = []
     connector_count = base_connector_count
     
-    for bone_name, bone_group in bone_vertex_groups.items():
+    # Faces (FaceArray rows are always triangles) as one (F, 3) index array so
+    # each bone's face test is a single gather
+    faces_arr = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    
+    # Bone group number of every face corner, computed once for all bones
+    # (-1 for vertices without a bone entry)
+    vertex_group_ids = np.full(len(vertices), -1, dtype=np.int32)
+    vertex_group_ids[:len(grouped_bones)] = group_rank[bone_inverse.reshape(-1)]
+    face_group_ids = vertex_group_ids[faces_arr]
+    
+    for group_id, bone_name in enumerate(group_bone_names):
         if bone_name not in created_bones:
-            print(f"      Skipping bone {bone_name} - not in armature")
+            if _VERBOSE:
+                print(f"      Skipping bone {bone_name} - not in armature")
             continue
             
         # Get ALL vertices for this bone
-        bone_vertex_indices = set(bone_group['vertex_indices'])
-        bone_vertices = bone_group['vertices']
+        own_indices = np.flatnonzero(vertex_group_ids == group_id)
         
-        # Create vertex mapping: original index -> new bone-local index
-        vertex_mapping = {}
-        final_vertices = []
+        # Create vertex mapping: original index -> new bone-local index, as a dense
+        # array where -1 means "not added yet" (one array load per probe)
+        vertex_mapping = np.full(len(vertices), -1, dtype=np.int64)
         
         # Add all vertices that belong to this bone
-        for orig_idx in bone_vertex_indices:
-            vertex_mapping[orig_idx] = len(final_vertices)
-            final_vertices.append(vertices[orig_idx])
+        vertex_mapping[own_indices] = np.arange(len(own_indices))
+        own_indices = own_indices.tolist()
+        own_vertex_count = len(own_indices)
+        final_vertices = own_indices  # Original vertex index of each connector vertex
+        
+        # Get faces that involve this bone's vertices (at least one corner in the group),
+        # with how many of their corners the bone already owns
+        own_corner_counts = (face_group_ids == group_id).sum(axis=1)
+        touching = own_corner_counts > 0
+        touching_arr = faces_arr[touching]
+        touching_faces = touching_arr.tolist()
+        own_corner_counts = own_corner_counts[touching].tolist()
+        # Remapped corners, valid for faces whose corners are all owned by this bone
+        owned_faces = vertex_mapping[touching_arr].tolist()
         
-        # Get faces that involve this bone's vertices
         bone_faces = []
-        for face in faces:
-            face_vertices_in_bone = [v_idx for v_idx in face if v_idx in bone_vertex_indices]
+        for face, own_count, owned_face in zip(touching_faces, own_corner_counts, owned_faces):
+            if own_count == 3:
+                # Fully inside the bone group - nothing to add
+                bone_faces.append(owned_face)
+                continue
             
-            if face_vertices_in_bone:  # Face has at least one vertex from this bone
-                # Add any missing vertices from this face to our vertex list
-                new_face = []
-                for v_idx in face:
-                    if v_idx in vertex_mapping:
-                        # Already have this vertex
-                        new_face.append(vertex_mapping[v_idx])
-                    else:
-                        # Add vertex from another bone
-                        vertex_mapping[v_idx] = len(final_vertices)
-                        final_vertices.append(vertices[v_idx])
-                        new_face.append(vertex_mapping[v_idx])
-                
-                bone_faces.append(new_face)
+            # Add any missing vertices from this face (from another bone) to our vertex
+            # list, in corner order; unrolled since FaceArray rows are always triangles
+            a, b, c = face
+            if vertex_mapping[a] < 0:
+                vertex_mapping[a] = len(final_vertices)
+                final_vertices.append(a)
+            if vertex_mapping[b] < 0:
+                vertex_mapping[b] = len(final_vertices)
+                final_vertices.append(b)
+            if vertex_mapping[c] < 0:
+                vertex_mapping[c] = len(final_vertices)
+                final_vertices.append(c)
+            
+            bone_faces.append([int(vertex_mapping[a]), int(vertex_mapping[b]), int(vertex_mapping[c])])
         
         if not bone_faces:
-            print(f"      No faces for bone {bone_name}")
+            if _VERBOSE:
+                print(f"      No faces for bone {bone_name}")
             continue
             
-        print(f"      Creating connector for {bone_name}: {len(final_vertices)} vertices, {len(bone_faces)} faces")
+        if _VERBOSE:
+            print(f"      Creating connector for {bone_name}: {len(final_vertices)} vertices, {len(bone_faces)} faces")
         
         # Create the connector mesh using exact VF3 vertex positioning
         try:
@@ -875,53 +1230,36 @@ def process_vf3_dynamic_visual_faces(vertices, vertex_bones, faces, dyn_idx, wor
             mesh = bpy.data.meshes.new(mesh_name)
             
             # Process vertices with VF3-accurate positioning
-            blender_vertices = []
-            vertex_bone_names = []
-            
             bone_pos = world_transforms.get(bone_name, (0.0, 0.0, 0.0))
             
-            for i, vertex_tuple in enumerate(final_vertices):
-                pos1, pos2 = vertex_tuple
-                
-                # Use pos1 with bone world transform (like regular meshes)
-                world_pos = [
-                    pos1[0] + bone_pos[0],
-                    pos1[1] + bone_pos[1], 
-                    pos1[2] + bone_pos[2]
-                ]
-                
-                blender_vertices.append(world_pos)
-                # Determine which bone this vertex should be bound to
-                if i < len(bone_vertex_indices):
-                    vertex_bone_names.append(bone_name)
-                else:
-                    # Vertex was added from another bone - find which one
-                    orig_idx = list(vertex_mapping.keys())[list(vertex_mapping.values()).index(i)]
-                    if orig_idx < len(vertex_bones):
-                        vertex_bone_names.append(vertex_bones[orig_idx])
-                    else:
-                        vertex_bone_names.append(bone_name)  # Fallback
+            # Use pos1 with bone world transform (like regular meshes), as one broadcast add
+            blender_vertices = pos1_all[final_vertices] + np.asarray(bone_pos, dtype=np.float64)
+            
+            # Determine which bone each vertex should be bound to: this bone for its own
+            # vertices; vertices added from another bone keep that bone (final_vertices is
+            # the inverse of vertex_mapping), falling back to this bone
+            vertex_bone_names = [bone_name] * own_vertex_count
+            vertex_bone_names.extend(vertex_bones[orig_idx] if orig_idx < vertex_bones_count else bone_name
+                                     for orig_idx in final_vertices[own_vertex_count:])
             
-            # Create mesh
-            mesh.from_pydata(blender_vertices, [], bone_faces)
-            mesh.update()
+            # Create mesh straight from the NumPy buffers (bone_faces rows are triangles)
+            _fill_mesh_from_arrays(mesh, blender_vertices, np.asarray(bone_faces, dtype=np.int32).reshape(-1, 3))
             
             # Create mesh object
             mesh_obj = bpy.data.objects.new(mesh_name, mesh)
             bpy.context.collection.objects.link(mesh_obj)
             mesh_objects.append(mesh_obj)
             
-            # Create vertex groups and bind to bones
-            created_vertex_groups = set()
+            # Create vertex groups and bind to bones: indices grouped per bone first so
+            # each group gets a single add() with full weight
+            bone_bind_indices = {}
             for vertex_idx, bone_bind_name in enumerate(vertex_bone_names):
-                if bone_bind_name in created_bones and bone_bind_name not in created_vertex_groups:
-                    vg = mesh_obj.vertex_groups.new(name=bone_bind_name)
-                    created_vertex_groups.add(bone_bind_name)
-                
-                # Assign vertex to its bone group with full weight
-                if bone_bind_name in created_vertex_groups:
-                    vg = mesh_obj.vertex_groups[bone_bind_name]
-                    vg.add([vertex_idx], 1.0, 'REPLACE')
+                if bone_bind_name in created_bones:
+                    bone_bind_indices.setdefault(bone_bind_name, []).append(vertex_idx)
+            
+            for bone_bind_name, vertex_indices in bone_bind_indices.items():
+                vg = mesh_obj.vertex_groups.new(name=bone_bind_name)
+                vg.add(vertex_indices, 1.0, 'REPLACE')
             
             # Parent to armature with automatic weights disabled (we set exact weights)
             mesh_obj.parent = armature_obj
@@ -938,26 +1276,49 @@ def process_vf3_dynamic_visual_faces(vertices, vertex_bones, faces, dyn_idx, wor
     return connectors_created
 
 
-def _snap_vertex_to_nearest_mesh(candidate_pos: List[float], all_mesh_vertices: 'np.ndarray', snap_threshold: float = 1.5) -> List[float]:
-    """Snap a vertex to the nearest existing mesh vertex if within threshold to eliminate seams."""
-    import numpy as np
+def _join_objects_into(primary, others):
+    """Join `others` into `primary` (bpy.ops.object.join) and leave primary active.
     
-    if len(all_mesh_vertices) == 0:
-        return candidate_pos
-    
-    candidate_array = np.array(candidate_pos)
+    Only the objects that are currently selected get deselected, instead of a
+    scene-wide select_all; on Blender 3.2+ the join itself reads its object set
+    from a context override rather than from selection flags.
+    """
+    import bpy
     
-    # Find closest vertex using vectorized distance calculation
-    distances = np.linalg.norm(all_mesh_vertices - candidate_array, axis=1)
-    min_distance = np.min(distances)
+    view_layer = bpy.context.view_layer
+    for obj in list(view_layer.objects.selected):
+        obj.select_set(False)
+    view_layer.objects.active = primary
     
-    if min_distance <= snap_threshold:
-        closest_idx = np.argmin(distances)
-        snapped_pos = all_mesh_vertices[closest_idx].tolist()
-        # print(f"      Snapped vertex: distance {min_distance:.3f} -> snapped to existing vertex")
-        return snapped_pos
+    if hasattr(bpy.context, 'temp_override'):
+        with bpy.context.temp_override(active_object=primary, selected_objects=[primary, *others],
+                                       selected_editable_objects=[primary, *others]):
+            bpy.ops.object.join()
     else:
-        return candidate_pos
+        primary.select_set(True)
+        for obj in others:
+            obj.select_set(True)
+        bpy.ops.object.join()
+
+
+def _clean_merge_seams(mesh_obj):
+    """Merge near-duplicate vertices (0.001) and make normals consistent on a joined mesh.
+    
+    Runs on a throwaway BMesh built from the object data, so no edit-mode
+    round trip or operator dispatch is needed.
+    """
+    import bmesh
+    
+    mesh = mesh_obj.data
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.001)  # Merge very close vertices
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+    mesh.update()
 
 
 def _merge_breast_meshes_with_body(mesh_objects):
@@ -991,31 +1352,14 @@ def _merge_breast_meshes_with_body(mesh_objects):
     print(f"  Found {len(breast_meshes)} breast meshes: {[m.name for m in breast_meshes]}")
     
     # Store names BEFORE join operation since objects will become invalid
-    merged_names = [m.name for m in breast_meshes]
+    merged_names = {m.name for m in breast_meshes}
     
     try:
-        # Select all meshes to be merged
-        bpy.ops.object.select_all(action='DESELECT')
-        
-        # Select body mesh as primary target
-        body_mesh.select_set(True)
-        
-        # Select all breast meshes
-        for breast_mesh in breast_meshes:
-            breast_mesh.select_set(True)
-        
-        # Set body mesh as active object
-        bpy.context.view_layer.objects.active = body_mesh
-        
-        # Join all selected meshes into the body mesh
-        bpy.ops.object.join()
+        # Join all breast meshes into the body mesh (body stays the active object)
+        _join_objects_into(body_mesh, breast_meshes)
         
         # Clean up seams between merged parts
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        _clean_merge_seams(body_mesh)
         
         # Remove merged breast meshes from mesh_objects list since they no longer exist
         
@@ -1083,13 +1427,13 @@ def _merge_feet_meshes_with_legs(mesh_objects):
     
     print(f"  Found {len(leg_foot_pairs)} leg-foot pairs to merge")
     
-    merged_names = []
+    merged_names = set()
     
     for leg_mesh, foot_mesh, side in leg_foot_pairs:
         print(f"  Merging {side} foot ({foot_mesh.name}) with leg ({leg_mesh.name})")
         
         # Store foot name before merging
-        merged_names.append(foot_mesh.name)
+        merged_names.add(foot_mesh.name)
         
         try:
             # Select meshes to be merged
@@ -1107,11 +1451,7 @@ def _merge_feet_meshes_with_legs(mesh_objects):
             bpy.ops.object.join()
             
             # Clean up seams between merged parts
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-            bpy.ops.mesh.normals_make_consistent(inside=False)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            _clean_merge_seams(leg_mesh)
             
         except Exception as e:
             print(f"  ❌ Failed to merge {side} foot with leg: {e}")
@@ -1164,7 +1504,7 @@ def _merge_arms_meshes_with_body(mesh_objects):
     print(f"  Found {len(arm_meshes)} arm meshes: {[m.name for m in arm_meshes]}")
     
     # Store names BEFORE join operation since objects will become invalid
-    merged_names = [m.name for m in arm_meshes]
+    merged_names = {m.name for m in arm_meshes}
     
     try:
         # Select all meshes to be merged
@@ -1184,11 +1524,7 @@ def _merge_arms_meshes_with_body(mesh_objects):
         bpy.ops.object.join()
         
         # Clean up seams between merged parts
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        _clean_merge_seams(body_mesh)
         
         # Remove merged arm meshes from mesh_objects list
         valid_objects = []
@@ -1254,13 +1590,13 @@ def _merge_lower_legs_meshes_with_thighs(mesh_objects):
     
     print(f"  Found {len(thigh_lowerleg_pairs)} thigh-lowerleg pairs to merge")
     
-    merged_names = []
+    merged_names = set()
     
     for thigh_mesh, lowerleg_mesh, side in thigh_lowerleg_pairs:
         print(f"  Merging {side} lower leg ({lowerleg_mesh.name}) with thigh ({thigh_mesh.name})")
         
         # Store lower leg name before merging
-        merged_names.append(lowerleg_mesh.name)
+        merged_names.add(lowerleg_mesh.name)
         
         try:
             # Select meshes to be merged
@@ -1278,11 +1614,7 @@ def _merge_lower_legs_meshes_with_thighs(mesh_objects):
             bpy.ops.object.join()
             
             # Clean up seams between merged parts
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-            bpy.ops.mesh.normals_make_consistent(inside=False)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            _clean_merge_seams(thigh_mesh)
             
         except Exception as e:
             print(f"  ❌ Failed to merge {side} lower leg with thigh: {e}")
@@ -1348,13 +1680,13 @@ def _merge_forearms_meshes_with_arms(mesh_objects):
     
     print(f"  Found {len(arm_forearm_pairs)} arm-forearm pairs to merge")
     
-    merged_names = []
+    merged_names = set()
     
     for arm_mesh, forearm_mesh, side in arm_forearm_pairs:
         print(f"  Merging {side} forearm ({forearm_mesh.name}) with arm ({arm_mesh.name})")
         
         # Store forearm name before merging
-        merged_names.append(forearm_mesh.name)
+        merged_names.add(forearm_mesh.name)
         
         try:
             # Select meshes to be merged
@@ -1372,11 +1704,7 @@ def _merge_forearms_meshes_with_arms(mesh_objects):
             bpy.ops.object.join()
             
             # Clean up seams between merged parts
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-            bpy.ops.mesh.normals_make_consistent(inside=False)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            _clean_merge_seams(arm_mesh)
             
         except Exception as e:
             print(f"  ❌ Failed to merge {side} forearm with arm: {e}")
@@ -1442,13 +1770,13 @@ def _merge_hands_meshes_with_arms(mesh_objects):
     
     print(f"  Found {len(arm_hand_pairs)} arm-hand pairs to merge")
     
-    merged_names = []
+    merged_names = set()
     
     for arm_mesh, hand_mesh, side in arm_hand_pairs:
         print(f"  Merging {side} hand ({hand_mesh.name}) with arm ({arm_mesh.name})")
         
         # Store hand name before merging
-        merged_names.append(hand_mesh.name)
+        merged_names.add(hand_mesh.name)
         
         try:
             # Select meshes to be merged
@@ -1466,11 +1794,7 @@ def _merge_hands_meshes_with_arms(mesh_objects):
             bpy.ops.object.join()
             
             # Clean up seams between merged parts
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-            bpy.ops.mesh.normals_make_consistent(inside=False)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            _clean_merge_seams(arm_mesh)
             
         except Exception as e:
             print(f"  ❌ Failed to merge {side} hand with arm: {e}")
@@ -1523,7 +1847,7 @@ def _merge_legs_meshes_with_body(mesh_objects):
     print(f"  Found {len(leg_meshes)} leg meshes: {[m.name for m in leg_meshes]}")
     
     # Store names BEFORE join operation since objects will become invalid
-    merged_names = [m.name for m in leg_meshes]
+    merged_names = {m.name for m in leg_meshes}
     
     try:
         # Select all meshes to be merged
@@ -1543,11 +1867,7 @@ def _merge_legs_meshes_with_body(mesh_objects):
         bpy.ops.object.join()
         
         # Clean up seams between merged parts
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        _clean_merge_seams(body_mesh)
         
         # Remove merged leg meshes from mesh_objects list
         valid_objects = []
@@ -1574,8 +1894,9 @@ def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_group
     Split a contaminated connector mesh by bone groups and merge each group with appropriate targets.
     This fixes the issue where body connector contains arm/hand/waist geometry.
     """
-    print(f"        🚀 STARTING CONNECTOR SPLITTING for {connector_obj.name if connector_obj else 'None'}")
-    print(f"        📊 Input: {len(bone_groups)} bone groups, {len(mesh_objects)} mesh objects")
+    if _DEBUG:
+        print(f"        🚀 STARTING CONNECTOR SPLITTING for {connector_obj.name if connector_obj else 'None'}")
+        print(f"        📊 Input: {len(bone_groups)} bone groups, {len(mesh_objects)} mesh objects")
     
     try:
         import bpy
@@ -1589,7 +1910,8 @@ def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_group
         print("        ❌ No connector object provided")
         return False
         
-    print(f"        🔧 Connector object: {connector_obj.name}, vertices: {len(connector_obj.data.vertices) if connector_obj.data else 'N/A'}")
+    if _DEBUG:
+        print(f"        🔧 Connector object: {connector_obj.name}, vertices: {len(connector_obj.data.vertices) if connector_obj.data else 'N/A'}")
     
     # Define bone group targeting patterns
     bone_group_targets = {
@@ -1631,13 +1953,15 @@ def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_group
         
         # Create a filtered mesh containing only vertices from this bone group
         try:
-            print(f"        🔧 Creating filtered mesh for {bone_name} with {len(vertex_indices)} vertices...")
+            if _DEBUG:
+                print(f"        🔧 Creating filtered mesh for {bone_name} with {len(vertex_indices)} vertices...")
             filtered_mesh = _create_filtered_connector_mesh(
                 connector_obj, vertex_indices, f"{connector_obj.name}_{bone_name}"
             )
             
             if filtered_mesh:
-                print(f"        🔧 Filtered mesh created, attempting merge with {target_meshes[0].name}...")
+                if _DEBUG:
+                    print(f"        🔧 Filtered mesh created, attempting merge with {target_meshes[0].name}...")
                 # Merge the filtered mesh with the target(s)
                 primary_target = target_meshes[0]
                 merge_success = _merge_filtered_mesh_with_target(filtered_mesh, primary_target)
@@ -1732,10 +2056,37 @@ def _merge_filtered_mesh_with_target(filtered_obj, target_obj):
     return True
 
 
-def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone_names):
+# DynamicVisual material entries look like "(r,g,b)::" or "(r,g,b,a)::"
+_MATERIAL_COLOR_RE = re.compile(r'\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*(?:,\s*([\d.]+))?\s*\)')
+
+# Connector number in names like "dynamic_connector_0_vf3mesh"
+_CONNECTOR_NUM_RE = re.compile(r'dynamic_connector_(\d+)_')
+
+# Merge targets per DynamicVisual connector number, in VF3 processing order:
+# (body-part keywords, owner keywords, fallback names). A mesh is a candidate
+# when its lowercased name contains one keyword from each tuple.
+_CONNECTOR_MERGE_RULES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = {
+    # Body/torso connectors: prefer blazer body, fallback to female body
+    '0': (('body',), ('blazer', 'female'), ('body_female',)),
+    # WRIST connectors: prefer blazer hands, fallback to female hands
+    '1': (('hand',), ('blazer', 'female'), ('l_hand_female', 'r_hand_female')),
+    # SKIRT/WAIST connectors: prefer skirt, fallback to female waist
+    '2': (('waist', 'skirt'), ('satsuki', 'female'), ('waist_female', 'body_female')),
+    # KNEE connectors: skin legs only (not shoes)
+    '3': (('leg1', 'leg2'), ('female',), ('l_leg1_female', 'r_leg1_female', 'l_leg2_female', 'r_leg2_female')),
+    # ANKLE connectors: prefer shoes, fallback to female feet
+    '4': (('foot', 'shoe'), ('satsuki', 'female'), ('l_foot_female', 'r_foot_female', 'l_leg2_female', 'r_leg2_female')),
+    # Foot/ankle connectors
+    '5': (('foot', 'shoe'), ('satsuki', 'female'), ('l_foot_female', 'r_foot_female', 'l_leg2_female', 'r_leg2_female')),
+}
+
+
+def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone_names, deferred_cleanup=None):
     """
     Try to merge a DynamicVisual connector mesh with an adjacent body mesh to create unified geometry.
     This eliminates separate mesh instances and creates seamless connections.
+    If deferred_cleanup is a list, the joined target is appended to it instead of
+    running the seam cleanup (remove_doubles/normals) straight away.
     Returns: (success, merged_mesh_names) - success bool and list of mesh names that were merged and removed
     """
     try:
@@ -1752,8 +2103,7 @@ def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone
     connector_name = connector_obj.name.lower()
     
     # Extract connector number for special handling
-    import re
-    match = re.search(r'dynamic_connector_(\d+)_', connector_name)
+    match = _CONNECTOR_NUM_RE.search(connector_name)
     connector_number = match.group(1) if match else None
     
     # Special handling for connector 0: Split by bone groups if it contains mixed anatomy
@@ -1776,13 +2126,15 @@ def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone
         
         if has_body and (has_arms or has_hands):
             print(f"      🔧 SPLITTING CONTAMINATED CONNECTOR: {len(bone_groups)} bone groups detected")
-            for bone, vertices in bone_groups.items():
-                print(f"        {bone}: {len(vertices)} vertices")
+            if _DEBUG:
+                for bone, vertices in bone_groups.items():
+                    print(f"        {bone}: {len(vertices)} vertices")
+                print(f"      🚀 CALLING SPLITTING FUNCTION...")
             
-            print(f"      🚀 CALLING SPLITTING FUNCTION...")
             # Use bone group splitting instead of standard merge
             success = _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_groups, mesh_objects)
-            print(f"      📊 SPLITTING FUNCTION RETURNED: {success}")
+            if _DEBUG:
+                print(f"      📊 SPLITTING FUNCTION RETURNED: {success}")
             
             if success:
                 print(f"      ✅ Successfully split and merged contaminated connector {connector_name}")
@@ -1798,78 +2150,36 @@ def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone
     # This adapts to both naked (female) and clothed (blazer/skirt/shoes) configurations
     def get_dynamic_merge_candidates(connector_number, existing_mesh_names):
         """Get appropriate merge targets based on what meshes actually exist."""
-        existing_names_lower = [name.lower() for name in existing_mesh_names]
-        
-        # CORRECTED MAPPING based on actual VF3 DynamicVisual processing order
-        if connector_number == '0':  # Body/torso connectors (CORRECT)
-            # Prefer blazer body, fallback to female body
-            candidates = []
-            for name in existing_names_lower:
-                if 'body' in name and ('blazer' in name or 'female' in name):
-                    candidates.append(name)
-            return candidates or ['body_female']
-            
-        elif connector_number == '1':  # WRIST connectors (was incorrectly mapped to elbows)
-            # Prefer blazer hands, fallback to female hands
-            candidates = []
-            for name in existing_names_lower:
-                if 'hand' in name and ('blazer' in name or 'female' in name):
-                    candidates.append(name)
-            return candidates or ['l_hand_female', 'r_hand_female']
-            
-        elif connector_number == '2':  # SKIRT/WAIST connectors (was incorrectly mapped to hands)
-            # This should target waist/skirt area - prefer skirt, fallback to female waist
-            candidates = []
-            for name in existing_names_lower:
-                if ('waist' in name or 'skirt' in name) and ('satsuki' in name or 'female' in name):
-                    candidates.append(name)
-            return candidates or ['waist_female', 'body_female']
-            
-        elif connector_number == '3':  # KNEE connectors (was incorrectly mapped to waist)
-            # Should target skin legs (not shoes), prefer female legs
-            candidates = []
-            for name in existing_names_lower:
-                if ('leg1' in name or 'leg2' in name) and 'female' in name:
-                    candidates.append(name)
-            return candidates or ['l_leg1_female', 'r_leg1_female', 'l_leg2_female', 'r_leg2_female']
-            
-        elif connector_number == '4':  # ANKLE connectors (was incorrectly mapped to knees)
-            # Prefer shoes, fallback to female feet
-            candidates = []
-            for name in existing_names_lower:
-                if ('foot' in name or 'shoe' in name) and ('satsuki' in name or 'female' in name):
-                    candidates.append(name)
-            return candidates or ['l_foot_female', 'r_foot_female', 'l_leg2_female', 'r_leg2_female']
-            
-        elif connector_number == '5':  # Foot/ankle connectors
-            # Prefer shoes, fallback to female feet
-            candidates = []
-            for name in existing_names_lower:
-                if ('foot' in name or 'shoe' in name) and ('satsuki' in name or 'female' in name):
-                    candidates.append(name)
-            return candidates or ['l_foot_female', 'r_foot_female', 'l_leg2_female', 'r_leg2_female']
-            
-        return []  # Unknown connector number
+        rule = _CONNECTOR_MERGE_RULES.get(connector_number)
+        if rule is None:
+            return []  # Unknown connector number
+        
+        part_keywords, owner_keywords, fallback = rule
+        candidates = []
+        for name in existing_mesh_names:
+            name = name.lower()
+            if any(k in name for k in part_keywords) and any(k in name for k in owner_keywords):
+                candidates.append(name)
+        return candidates or list(fallback)
     
     # Get list of existing mesh names for dynamic targeting
     existing_mesh_names = [mesh_obj.name for mesh_obj in mesh_objects if hasattr(mesh_obj, 'name')]
     merge_candidates_by_number = {}
     
-    # Extract connector number from name (e.g., "dynamic_connector_0_vf3mesh" -> "0")
+    # Connector number from name (e.g., "dynamic_connector_0_vf3mesh" -> "0"), parsed above
     target_categories = []
-    import re
-    match = re.search(r'dynamic_connector_(\d+)_', connector_name)
-    if match:
-        connector_number = match.group(1)
+    if connector_number is not None:
         target_categories = get_dynamic_merge_candidates(connector_number, existing_mesh_names)
         # ENHANCED DEBUG LOGGING FOR CONNECTOR MERGING
-        print(f"      🔍 ENHANCED DEBUG: Processing connector {connector_name}")
-        print(f"         Connector number extracted: {connector_number}")
-        print(f"         Target categories from targeting logic: {target_categories}")
-        print(f"         All available mesh objects: {[obj.name for obj in mesh_objects]}")
+        if _DEBUG:
+            print(f"      🔍 ENHANCED DEBUG: Processing connector {connector_name}")
+            print(f"         Connector number extracted: {connector_number}")
+            print(f"         Target categories from targeting logic: {target_categories}")
+            print(f"         All available mesh objects: {[obj.name for obj in mesh_objects]}")
         print(f"      Connector {connector_number} -> DYNAMIC merge targets: {target_categories}")
-        print(f"        Available meshes: {[name for name in existing_mesh_names if any(keyword in name.lower() for keyword in ['body', 'arm', 'hand', 'waist', 'leg', 'foot', 'skirt', 'blazer'])]}")
-        print(f"        🔍 DEBUG: Full available mesh list: {existing_mesh_names}")
+        if _DEBUG:
+            print(f"        Available meshes: {[name for name in existing_mesh_names if any(keyword in name.lower() for keyword in ['body', 'arm', 'hand', 'waist', 'leg', 'foot', 'skirt', 'blazer'])]}")
+            print(f"        🔍 DEBUG: Full available mesh list: {existing_mesh_names}")
     else:
         # Fallback to old logic for non-numbered connectors
         merge_candidates = {
@@ -1893,19 +2203,18 @@ def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone
         print(f"      No merge candidates found for connector: {connector_name}")
         return False, []
     
-    # Find all target mesh objects that match the categories
+    # Find all target mesh objects that match the categories (candidates lowercased once)
+    target_categories_lower = tuple(candidate.lower() for candidate in target_categories)
     target_meshes = []
     for mesh_obj in mesh_objects:
         try:
             # Test if object is still valid by accessing its name
             mesh_name_lower = mesh_obj.name.lower()
-            for candidate in target_categories:
-                if candidate.lower() in mesh_name_lower:
-                    target_meshes.append(mesh_obj)
-                    break
         except (ReferenceError, AttributeError):
             # Object has been deleted, skip it
             continue
+        if any(candidate in mesh_name_lower for candidate in target_categories_lower):
+            target_meshes.append(mesh_obj)
     
     if not target_meshes:
         # If no specific targets found, try to merge with the unified body mesh
@@ -1934,26 +2243,14 @@ def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone
             primary_target = target_meshes[0]  # Use first mesh as primary target
             merged_names = [m.name for m in target_meshes[1:]]  # Exclude primary target which still exists
             
-            # Select all target meshes and the connector
-            bpy.ops.object.select_all(action='DESELECT')
-            
-            # Select all meshes to be merged
-            for mesh in target_meshes:
-                mesh.select_set(True)
-            connector_obj.select_set(True)
-            
-            # Set primary target as active object
-            bpy.context.view_layer.objects.active = primary_target
-            
-            # Join all selected meshes into the primary target
-            bpy.ops.object.join()
+            # Join the other target meshes and the connector into the primary target
+            _join_objects_into(primary_target, [*target_meshes[1:], connector_obj])
             
             # Clean up seams
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-            bpy.ops.mesh.normals_make_consistent(inside=False)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            if deferred_cleanup is not None:
+                deferred_cleanup.append(primary_target)
+            else:
+                _clean_merge_seams(primary_target)
             
             print(f"      ✅ Successfully merged connector {connector_name} with {len(target_meshes)} meshes into {primary_target.name}")
             return True, merged_names
@@ -1961,22 +2258,14 @@ def _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone
             # Single target mesh - use original logic
             target_mesh = target_meshes[0]
             
-            # Select both meshes
-            bpy.context.view_layer.objects.active = target_mesh
-            bpy.ops.object.select_all(action='DESELECT')
-            target_mesh.select_set(True)
-            connector_obj.select_set(True)
-            
             # Join the meshes (connector into target)
-            bpy.context.view_layer.objects.active = target_mesh
-            bpy.ops.object.join()
+            _join_objects_into(target_mesh, [connector_obj])
             
             # Clean up any duplicate vertices at the seam
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge very close vertices
-            bpy.ops.mesh.normals_make_consistent(inside=False)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            if deferred_cleanup is not None:
+                deferred_cleanup.append(target_mesh)
+            else:
+                _clean_merge_seams(target_mesh)
             
             print(f"      ✅ Successfully merged connector {connector_name} with {target_mesh.name}")
             return True, []  # No additional meshes were removed in single target merge
@@ -2005,17 +2294,47 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
     connector_count = 0
     created_regions = set()  # Track regions already created to prevent duplicates
     
-    # Collect all mesh vertices for snapping
-    all_mesh_vertices = []
+    # Collect all mesh vertices for snapping (bulk copy + one matrix multiply per mesh)
+    vertex_chunks = []
     for mesh_obj in mesh_objects:
         if hasattr(mesh_obj.data, 'vertices'):
-            for v in mesh_obj.data.vertices:
-                world_co = mesh_obj.matrix_world @ v.co
-                all_mesh_vertices.append(world_co)
-    
-    all_mesh_vertices = np.array([[v.x, v.y, v.z] for v in all_mesh_vertices])
+            n = len(mesh_obj.data.vertices)
+            co = np.empty(n * 3, dtype=np.float32)
+            mesh_obj.data.vertices.foreach_get("co", co)
+            m = np.array(mesh_obj.matrix_world, dtype=np.float32)
+            vertex_chunks.append(co.reshape(n, 3) @ m[:3, :3].T + m[:3, 3])
+    
+    if vertex_chunks:
+        all_mesh_vertices = np.concatenate(vertex_chunks)
+    else:
+        all_mesh_vertices = np.empty((0, 3), dtype=np.float32)
     print(f"  Collected {len(all_mesh_vertices)} vertices from existing meshes for snapping")
     
+    # Hash the snap targets into a uniform grid (cell = snap distance) once for every block below
+    snap_distance = 0.5
+    snap_grid = _build_snap_grid(all_mesh_vertices, snap_distance)
+    
+    # Bone translations as one table; the extra last row is the origin for unknown bones
+    bone_table_index = {name: i for i, name in enumerate(world_transforms)}
+    bone_translations = np.zeros((len(bone_table_index) + 1, 3), dtype=np.float64)
+    if bone_table_index:
+        bone_translations[:-1] = [world_transforms[name] for name in bone_table_index]
+    unknown_bone_row = len(bone_table_index)
+    
+    skin_color = (1.000, 0.759, 0.586)  # Standard skin tone from regular meshes
+    skin_material = None  # Built on first use, shared by every skin-tone connector
+    
+    def new_connector_material(name, color):
+        material = bpy.data.materials.new(name=name)
+        material.use_nodes = True
+        bsdf = material.node_tree.nodes.get("Principled BSDF")
+        if bsdf:
+            bsdf.inputs['Base Color'].default_value = (*color, 1.0)
+        return material
+    
+    # Pass 1: compute every connector's geometry in NumPy before touching bpy.data, so
+    # the meshes below are allocated and filled back to back
+    connector_plan = []
     for dyn_idx, dyn_data in enumerate(clothing_dynamic_meshes):
         if not (dyn_data and 'vertices' in dyn_data and 'faces' in dyn_data):
             continue
@@ -2031,138 +2350,153 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
         
         # Use TRUE VF3-accurate approach: Create ONE mesh per DynamicVisual block using EXACT FaceArray
         # This is exactly how VF3 works - no anatomical grouping, just one geometry per block
-        print(f"    Using TRUE VF3-accurate approach: ONE mesh with {len(faces)} exact faces")
+        if _VERBOSE:
+            print(f"    Using TRUE VF3-accurate approach: ONE mesh with {len(faces)} exact faces")
         
         # Use faces EXACTLY as provided by VF3 FaceArray (no reconstruction)
         connector_faces = faces  # Use exact face connectivity from VF3
         
         # Process vertices with their bone binding information + snap to eliminate seams
-        processed_vertices = []
-        vertex_bone_names = []
-        
-        for i, (vertex_tuple, bone_name) in enumerate(zip(vertices, vertex_bones)):
-            pos1, pos2 = vertex_tuple
-            
-            # Get bone's world position
-            bone_pos = world_transforms.get(bone_name, (0.0, 0.0, 0.0))
-            
-            # Use pos1 + bone transform (like regular meshes) - this is what VF3 does
-            candidate_pos = [
-                pos1[0] + bone_pos[0],
-                pos1[1] + bone_pos[1], 
-                pos1[2] + bone_pos[2]
-            ]
-            
-            # Snap to nearest existing mesh vertex to eliminate seams/gaps  
-            snapped_pos = _snap_vertex_to_nearest_mesh(candidate_pos, all_mesh_vertices, snap_threshold=0.5)
-            
-            processed_vertices.append(snapped_pos)
-            vertex_bone_names.append(bone_name)
         
+        # Use pos1 + bone transform (like regular meshes) - this is what VF3 does
+        bound_count = min(len(vertices), len(vertex_bones))
+        vertex_bone_names = list(vertex_bones[:bound_count])
+        bone_rows = np.fromiter((bone_table_index.get(name, unknown_bone_row) for name in vertex_bone_names),
+                                dtype=np.intp, count=bound_count)
+        pos1_array = np.array([vertex_tuple[0] for vertex_tuple in vertices[:bound_count]], dtype=np.float64).reshape(-1, 3)
+        processed_vertices = pos1_array + bone_translations[bone_rows]
+        
+        # Snap to nearest existing mesh vertex to eliminate seams/gaps: the whole block is
+        # answered by one grid query and snapped targets are written back in place
+        nearest = _find_nearest_in_grid(snap_grid, processed_vertices, snap_distance)
+        snapped = nearest >= 0
+        processed_vertices[snapped] = all_mesh_vertices[nearest[snapped]]
+        
+        # Vertices that snapped onto the same spot are welded here in NumPy: anything
+        # within 0.001 (the seam cleanup's remove_doubles distance) of an earlier kept
+        # vertex merges into it, so it reaches Blender as one vertex (the kept vertex
+        # keeps its bone) and collapsed faces never get built
+        connector_vertices, connector_faces, _loop_indices, kept_indices = _weld_vertices(
+            processed_vertices, connector_faces.reshape(-1, 3), merge_distance=0.001)
+        if kept_indices is not None:
+            vertex_bone_names = [vertex_bone_names[i] for i in kept_indices.tolist()]
+        
+        connector_plan.append((dyn_data, connector_vertices, connector_faces, vertex_bone_names))
+    
+    # Pass 2: allocate and fill the Blender connector meshes
+    created_connectors = []
+    for dyn_data, connector_vertices, connector_faces, vertex_bone_names in connector_plan:
         # Create ONE Blender mesh for this entire DynamicVisual block (like VF3)
         connector_name = f"dynamic_connector_{connector_count}_vf3mesh"
         blender_mesh = bpy.data.meshes.new(connector_name)
         
-        # Create mesh with EXACT VF3 faces - no modifications
-        vertices_list = [[v[0], v[1], v[2]] for v in processed_vertices]
-        faces_list = connector_faces  # Use exact faces from VF3 FaceArray
-        
-        blender_mesh.from_pydata(vertices_list, [], faces_list)
-        blender_mesh.update()
+        # Create mesh with EXACT VF3 faces - no modifications (FaceArray rows are triangles)
+        _fill_mesh_from_arrays(blender_mesh, connector_vertices, connector_faces)
         
         # Enable smooth shading
-        for poly in blender_mesh.polygons:
-            poly.use_smooth = True
+        blender_mesh.polygons.foreach_set("use_smooth", np.ones(len(blender_mesh.polygons), dtype=bool))
         
         # Create mesh object
         connector_obj = bpy.data.objects.new(connector_name, blender_mesh)
         bpy.context.collection.objects.link(connector_obj)
         
         # Create material using actual VF3 material data
-        material = bpy.data.materials.new(name=f"{connector_name}_material")
-        material.use_nodes = True
-        bsdf = material.node_tree.nodes.get("Principled BSDF")
-        if bsdf:
-            # Use actual material color from DynamicVisual Material section
-            skin_color = (1.000, 0.759, 0.586)  # Standard skin tone from regular meshes
-            applied_color = skin_color  # Default to skin tone for all connectors
-            
-            if 'materials' in dyn_data and len(dyn_data['materials']) > 0:
-                # Parse the first material entry: (r,g,b,a)::
-                material_line = dyn_data['materials'][0]
-                try:
-                    # Extract color values from "(r,g,b,a)::" format
-                    if material_line.startswith('(') and ')' in material_line:
-                        color_part = material_line[material_line.find('(')+1:material_line.find(')')]
-                        color_values = [float(x.strip()) for x in color_part.split(',')]
-                        if len(color_values) >= 3:
-                            # Convert from 0-255 range to 0-1 range and apply gamma correction like regular meshes
-                            r = (color_values[0] / 255.0) ** 2.2
-                            g = (color_values[1] / 255.0) ** 2.2  
-                            b = (color_values[2] / 255.0) ** 2.2
-                            a = color_values[3] / 255.0 if len(color_values) > 3 else 1.0
-                            
-                            # Only use parsed color if it's not pure white (which often means "use default")
-                            # SPECIAL CASE: Override VF3 material for skin connectors with skin tone
-                            connector_name = connector_obj.name.lower()
-                            should_use_skin = False
-                            if 'dynamic_connector_3_' in connector_name:  # CORRECTED: Knee connectors are #3
-                                should_use_skin = True
-                                print(f"      Overriding VF3 material for knee connector to use skin tone")
-                            elif 'dynamic_connector_0_' in connector_name and any('female' in name.lower() for name in [mesh_obj.name for mesh_obj in bpy.context.scene.objects if mesh_obj.type == 'MESH']):  # Body connectors in naked mode
-                                should_use_skin = True
-                                print(f"      Overriding VF3 material for body connector to use skin tone (naked mode)")
-                            
-                            if should_use_skin or (r > 0.95 and g > 0.95 and b > 0.95):
-                                print(f"      VF3 material overridden/white, using skin tone instead: ({applied_color[0]:.3f}, {applied_color[1]:.3f}, {applied_color[2]:.3f})")
-                            else:
-                                applied_color = (r, g, b)
-                                print(f"      Applied VF3 material color: ({r:.3f}, {g:.3f}, {b:.3f})")
-                        else:
-                            print(f"      Invalid material values, using skin tone: ({applied_color[0]:.3f}, {applied_color[1]:.3f}, {applied_color[2]:.3f})")
+        material_name = f"{connector_name}_material"
+        # Use actual material color from DynamicVisual Material section
+        applied_color = skin_color  # Default to skin tone for all connectors
+        
+        if 'materials' in dyn_data and len(dyn_data['materials']) > 0:
+            # Parse the first material entry: (r,g,b,a)::
+            material_line = dyn_data['materials'][0]
+            try:
+                # Extract color values from "(r,g,b,a)::" format
+                color_match = _MATERIAL_COLOR_RE.match(material_line)
+                if color_match:
+                    # Convert from 0-255 range to 0-1 range and apply gamma correction like regular meshes
+                    r, g, b = ((float(color_match.group(k)) / 255.0) ** 2.2 for k in (1, 2, 3))
+                    a = float(color_match.group(4)) / 255.0 if color_match.group(4) else 1.0
+                    
+                    # Only use parsed color if it's not pure white (which often means "use default")
+                    # SPECIAL CASE: Override VF3 material for skin connectors with skin tone
+                    connector_name = connector_obj.name.lower()
+                    should_use_skin = False
+                    if 'dynamic_connector_3_' in connector_name:  # CORRECTED: Knee connectors are #3
+                        should_use_skin = True
+                        if _VERBOSE:
+                            print(f"      Overriding VF3 material for knee connector to use skin tone")
+                    elif 'dynamic_connector_0_' in connector_name and any('female' in name.lower() for name in [mesh_obj.name for mesh_obj in bpy.context.scene.objects if mesh_obj.type == 'MESH']):  # Body connectors in naked mode
+                        should_use_skin = True
+                        if _VERBOSE:
+                            print(f"      Overriding VF3 material for body connector to use skin tone (naked mode)")
+                    
+                    if should_use_skin or (r > 0.95 and g > 0.95 and b > 0.95):
+                        if _VERBOSE:
+                            print(f"      VF3 material overridden/white, using skin tone instead: ({applied_color[0]:.3f}, {applied_color[1]:.3f}, {applied_color[2]:.3f})")
                     else:
+                        applied_color = (r, g, b)
+                        if _VERBOSE:
+                            print(f"      Applied VF3 material color: ({r:.3f}, {g:.3f}, {b:.3f})")
+                else:
+                    if _VERBOSE:
                         print(f"      Invalid material format, using skin tone: ({applied_color[0]:.3f}, {applied_color[1]:.3f}, {applied_color[2]:.3f})")
-                except:
+            except:
+                if _VERBOSE:
                     print(f"      Failed to parse material, using skin tone: ({applied_color[0]:.3f}, {applied_color[1]:.3f}, {applied_color[2]:.3f})")
-            else:
+        else:
+            if _VERBOSE:
                 print(f"      No material data, using skin tone: ({applied_color[0]:.3f}, {applied_color[1]:.3f}, {applied_color[2]:.3f})")
-                
-            bsdf.inputs['Base Color'].default_value = (*applied_color, 1.0)
+        
+        if applied_color == skin_color:
+            # Skin-tone connectors share one material instead of building a node tree each
+            if skin_material is None:
+                skin_material = new_connector_material("dynamic_connector_skin_material", skin_color)
+            material = skin_material
+        else:
+            material = new_connector_material(material_name, applied_color)
         connector_obj.data.materials.append(material)
         
-        # Bind vertices to their respective bones (like VF3 does with bone flags)
-        created_vertex_groups = set()
+        # Bind vertices to their respective bones (like VF3 does with bone flags).
+        # Index lists are built once per bone so each group gets a single add() call.
+        bone_vertex_indices = {}
         for vertex_idx, bone_name in enumerate(vertex_bone_names):
-            if bone_name in created_bones and bone_name not in created_vertex_groups:
-                vertex_group = connector_obj.vertex_groups.new(name=bone_name)
-                created_vertex_groups.add(bone_name)
-            
-            # Bind this vertex to its bone with full weight
-            if bone_name in created_vertex_groups:
-                vertex_group = connector_obj.vertex_groups[bone_name]
-                vertex_group.add([vertex_idx], 1.0, 'REPLACE')
+            if bone_name in created_bones:
+                bone_vertex_indices.setdefault(bone_name, []).append(vertex_idx)
+        
+        for bone_name, vertex_indices in bone_vertex_indices.items():
+            vertex_group = connector_obj.vertex_groups.new(name=bone_name)
+            vertex_group.add(vertex_indices, 1.0, 'REPLACE')
         
         # Add armature modifier
         armature_modifier = connector_obj.modifiers.new(name="Armature", type='ARMATURE')
         armature_modifier.object = armature_obj
         armature_modifier.use_vertex_groups = True
         
+        created_connectors.append((connector_obj, connector_name, vertex_bone_names,
+                                   len(connector_vertices), len(connector_faces)))
+        connector_count += 1
+    
+    # Pass 3: merge connectors into adjacent body meshes, in creation order. Seam cleanup
+    # is queued so each joined target gets one edit-mode pass however many connectors it took
+    cleanup_targets = []
+    for connector_obj, connector_name, vertex_bone_names, vertex_count, face_count in created_connectors:
         # Try to merge this connector with adjacent body meshes to eliminate seams completely
-        merged_with_existing, merged_mesh_names = _try_merge_connector_with_body_mesh(connector_obj, mesh_objects, vertex_bone_names)
+        merged_with_existing, merged_mesh_names = _try_merge_connector_with_body_mesh(
+            connector_obj, mesh_objects, vertex_bone_names, deferred_cleanup=cleanup_targets)
         
         if not merged_with_existing:
             # Add to mesh objects list for export only if not merged
             mesh_objects.append(connector_obj)
-            print(f"    ✅ Created standalone VF3 connector: {connector_name} with {len(vertices_list)} vertices, {len(faces_list)} faces")
+            print(f"    ✅ Created standalone VF3 connector: {connector_name} with {vertex_count} vertices, {face_count} faces")
         else:
             # Remove merged meshes from mesh_objects list to prevent issues with subsequent connectors
             if merged_mesh_names:
                 # Be careful with object filtering - check if objects are still valid
+                merged_name_set = set(merged_mesh_names)
                 valid_objects = []
                 for m in mesh_objects:
                     try:
                         mesh_name = m.name
-                        if mesh_name not in merged_mesh_names:
+                        if mesh_name not in merged_name_set:
                             valid_objects.append(m)
                     except (ReferenceError, AttributeError):
                         # Object has been deleted, skip it
@@ -2171,61 +2505,73 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
                 print(f"    ✅ Merged VF3 connector: {connector_name} with existing body mesh, removed {len(merged_mesh_names)} merged meshes from list")
             else:
                 print(f"    ✅ Merged VF3 connector: {connector_name} with existing body mesh")
-        
-        connector_count += 1
+    
+    cleaned_targets = set()
+    for target_obj in cleanup_targets:
+        try:
+            target_name = target_obj.name
+        except (ReferenceError, AttributeError):
+            # Joined into a later target, which is queued as well
+            continue
+        if target_name in cleaned_targets:
+            continue
+        cleaned_targets.add(target_name)
+        try:
+            _clean_merge_seams(target_obj)
+        except Exception as e:
+            print(f"    ❌ Failed to clean up connector seams on {target_name}: {e}")
+    
     return connector_count
 
 
+# Joint bone weights for each connector region type - CORRECTED ANATOMY
+_JOINT_WEIGHT_MAPPINGS: Dict[str, Dict[str, float]] = {
+    # Shoulder joints: mostly body connection to upper arm
+    'left_shoulder': {'body': 0.7, 'l_arm1': 0.3},
+    'right_shoulder': {'body': 0.7, 'r_arm1': 0.3},
+    
+    # Elbow joints: blend between upper arm (l_arm1) and forearm (l_arm2)
+    'left_elbow': {'l_arm1': 0.5, 'l_arm2': 0.5},
+    'right_elbow': {'r_arm1': 0.5, 'r_arm2': 0.5},
+    
+    # Forearm regions (when not part of elbow joint)
+    'left_forearm': {'l_arm2': 1.0},
+    'right_forearm': {'r_arm2': 1.0},
+    
+    # Wrist joints: blend between forearm and hand
+    'left_wrist': {'l_arm2': 0.7, 'l_hand': 0.3},
+    'right_wrist': {'r_arm2': 0.7, 'r_hand': 0.3},
+    
+    # Hip joints: blend between waist and thigh (l_leg1 = thigh bone)
+    'left_hip': {'waist': 0.6, 'l_leg1': 0.4},
+    'right_hip': {'waist': 0.6, 'r_leg1': 0.4},
+    
+    # Knee joints: blend between thigh (l_leg1) and shin (l_leg2)  
+    'left_knee': {'l_leg1': 0.5, 'l_leg2': 0.5},
+    'right_knee': {'r_leg1': 0.5, 'r_leg2': 0.5},
+    
+    # Ankle joints: blend between shin and foot
+    'left_ankle': {'l_leg2': 0.7, 'l_foot': 0.3},
+    'right_ankle': {'r_leg2': 0.7, 'r_foot': 0.3},
+    
+    # Breast connection: merged connector with both breast bones
+    'breast_connection': {'body': 0.6, 'l_breast': 0.2, 'r_breast': 0.2},
+    
+    # Torso connection: only body (waist handled by separate mesh)
+    'torso': {'body': 1.0},
+}
+
+
 def _get_joint_bone_weights_for_region(region_name: str, region_vertex_bones: List[str], created_bones: Dict) -> Dict[str, float]:
     """
     Determine which bones should influence a connector region and with what weights.
     This enables proper joint deformation (e.g., elbow connectors bend with elbow rotation).
     """
-    # Define joint bone weights for each region type - CORRECTED ANATOMY
-    joint_weight_mappings = {
-        # Shoulder joints: mostly body connection to upper arm
-        'left_shoulder': {'body': 0.7, 'l_arm1': 0.3},
-        'right_shoulder': {'body': 0.7, 'r_arm1': 0.3},
-        
-        # Elbow joints: blend between upper arm (l_arm1) and forearm (l_arm2)
-        'left_elbow': {'l_arm1': 0.5, 'l_arm2': 0.5},
-        'right_elbow': {'r_arm1': 0.5, 'r_arm2': 0.5},
-        
-        # Forearm regions (when not part of elbow joint)
-        'left_forearm': {'l_arm2': 1.0},
-        'right_forearm': {'r_arm2': 1.0},
-        
-        # Wrist joints: blend between forearm and hand
-        'left_wrist': {'l_arm2': 0.7, 'l_hand': 0.3},
-        'right_wrist': {'r_arm2': 0.7, 'r_hand': 0.3},
-        
-        # Hip joints: blend between waist and thigh (l_leg1 = thigh bone)
-        'left_hip': {'waist': 0.6, 'l_leg1': 0.4},
-        'right_hip': {'waist': 0.6, 'r_leg1': 0.4},
-        
-        # Knee joints: blend between thigh (l_leg1) and shin (l_leg2)  
-        'left_knee': {'l_leg1': 0.5, 'l_leg2': 0.5},
-        'right_knee': {'r_leg1': 0.5, 'r_leg2': 0.5},
-        
-        # Ankle joints: blend between shin and foot
-        'left_ankle': {'l_leg2': 0.7, 'l_foot': 0.3},
-        'right_ankle': {'r_leg2': 0.7, 'r_foot': 0.3},
-        
-        # Breast connection: merged connector with both breast bones
-        'breast_connection': {'body': 0.6, 'l_breast': 0.2, 'r_breast': 0.2},
-        
-        # Torso connection: only body (waist handled by separate mesh)
-        'torso': {'body': 1.0},
-    }
-    
-    # Return the bone weights for this region, filtered by available bones
-    if region_name in joint_weight_mappings:
-        weights = joint_weight_mappings[region_name]
-        # Only return weights for bones that actually exist in the armature
-        return {bone: weight for bone, weight in weights.items() if bone in created_bones}
-    else:
+    weights = _JOINT_WEIGHT_MAPPINGS.get(region_name)
+    if weights is None:
         # Unknown region - no specific weighting
         return {}
+    return {bone: weight for bone, weight in weights.items() if bone in created_bones}
 
 
 def _collect_attachments_with_occupancy_filtering(desc):
@@ -2257,15 +2603,11 @@ def _collect_attachments_with_occupancy_filtering(desc):
     
     skin_lines = desc.blocks.get('skin', [])
     for line in skin_lines:
-        if not line.strip() or ':' not in line:
-            continue
-        
         # Parse line format: "occupancy_vector:resource_id"
-        parts = line.strip().split(':', 1)
-        if len(parts) != 2:
+        occ_str, sep, resource_id = line.strip().partition(':')
+        if not sep:
             continue
-            
-        occ_str, resource_id = parts
+        
         occupancy_vector = parse_occupancy_vector(occ_str)
         
         # Resolve the resource ID to attachments and DynamicVisual data
@@ -2284,48 +2626,51 @@ def _collect_attachments_with_occupancy_filtering(desc):
     clothing_attachments_with_occupancy = []
     clothing_dynamic_meshes = []
     
+    # Resolved descriptor block name per looked-up name (None when absent), so each
+    # costume/vp name costs one dict probe however often it recurs
+    block_name_index = {}
+    
+    def resolve_block_name(name):
+        """Return `name` if it is a block, else its namespace-stripped form if that is one."""
+        if name not in block_name_index:
+            resolved = None
+            if name in desc.blocks:
+                resolved = name
+            elif '.' in name:
+                # Try without namespace prefix: "satsuki.blazer" -> "blazer"
+                short_name = name.split('.', 1)[1]
+                if short_name in desc.blocks:
+                    resolved = short_name
+            block_name_index[name] = resolved
+        return block_name_index[name]
+    
     # Parse clothing from default costume
     default_costume = parse_defaultcos(desc)
     print(f"  DEBUG: COSTUME MODE - Loading {len(default_costume)} costume items from defaultcos")
     for costume_item in default_costume:
         # Look for the costume item definition
         # Handle namespace: "satsuki.blazer" -> try both "satsuki.blazer" and "blazer"
-        block_name = None
-        if costume_item in desc.blocks:
-            block_name = costume_item
-        elif '.' in costume_item:
-            # Try without namespace prefix
-            short_name = costume_item.split('.', 1)[1]
-            if short_name in desc.blocks:
-                block_name = short_name
-                print(f"    DEBUG: Found block '{short_name}' for costume item '{costume_item}'")
+        block_name = resolve_block_name(costume_item)
+        if block_name and block_name != costume_item:
+            print(f"    DEBUG: Found block '{block_name}' for costume item '{costume_item}'")
         
         if block_name:
             print(f"    DEBUG: Processing costume block '{block_name}' for item '{costume_item}'")
             costume_lines = desc.blocks[block_name]
             print(f"    DEBUG: Block has {len(costume_lines)} lines: {costume_lines}")
             for line in costume_lines:
-                if not line.strip() or ':' not in line:
-                    continue
-                if line.strip().startswith('class:'):
-                    continue
-                
                 # Parse line format: "occupancy_vector:vp_block_name"
-                parts = line.strip().split(':', 1) 
-                if len(parts) != 2:
+                occ_str, sep, vp_block_name = line.strip().partition(':')
+                if not sep or occ_str == 'class':
                     continue
-                    
-                occ_str, vp_block_name = parts
+                
                 occupancy_vector = parse_occupancy_vector(occ_str)
                 
                 # Get attachments from the *_vp block (handle namespace)
-                vp_block = desc.blocks.get(vp_block_name)
-                if not vp_block and '.' in vp_block_name:
-                    # Try without namespace prefix
-                    short_vp_name = vp_block_name.split('.', 1)[1]
-                    vp_block = desc.blocks.get(short_vp_name)
-                    if vp_block:
-                        print(f"      DEBUG: Found vp_block '{short_vp_name}' for '{vp_block_name}'")
+                resolved_vp_name = resolve_block_name(vp_block_name)
+                vp_block = desc.blocks[resolved_vp_name] if resolved_vp_name else None
+                if vp_block and resolved_vp_name != vp_block_name:
+                    print(f"      DEBUG: Found vp_block '{resolved_vp_name}' for '{vp_block_name}'")
                 if vp_block:
                     clothing_attachments = parse_attachment_block_lines(vp_block)
                     clothing_dyn_mesh = parse_dynamic_visual_mesh(vp_block)
@@ -2436,14 +2781,14 @@ def _apply_trimesh_materials(mesh: 'trimesh.Trimesh', materials: List[dict], mes
             img = img.convert('RGBA')
         
         # Create alpha channel based on black pixels
-        data = np.array(img)
+        data = np.asarray(img)
         # Check for pixels that are very close to black (RGB < 5) - gentler to avoid white sheen
         black_mask = np.all(data[:, :, :3] < 5, axis=2)
-        # Set alpha to 0 for black pixels
-        data[black_mask, 3] = 0
         
-        # Update image with alpha channel (no flip - try original like working script)
-        img = Image.fromarray(data, 'RGBA')
+        # Set alpha to 0 for black pixels: only the alpha plane is rebuilt and swapped
+        # into the image (no flip - try original like working script), instead of
+        # re-wrapping a full RGBA copy with Image.fromarray
+        img.putalpha(Image.fromarray(np.where(black_mask, 0, data[:, :, 3]).astype(np.uint8), 'L'))
         material.baseColorTexture = img  # Direct assignment like original!
         
         # Set material to handle transparency
@@ -2472,8 +2817,19 @@ def _apply_trimesh_materials(mesh: 'trimesh.Trimesh', materials: List[dict], mes
         return mesh
 
 
-def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
+def _build_children(bones: Dict) -> Dict[str, List[str]]:
+    """Map each parent bone name to its children, in bones order."""
+    children = {}
+    for name, bone in bones.items():
+        if bone.parent:
+            children.setdefault(bone.parent, []).append(name)
+    return children
+
+
+def _get_bone_hierarchy_order(bones: Dict, children: Dict[str, List[str]] = None) -> List[str]:
     """Get bones in hierarchical order (parents before children)."""
+    if children is None:
+        children = _build_children(bones)
     roots = [name for name, bone in bones.items() if not bone.parent or bone.parent not in bones]
     
     ordered = []
@@ -2485,8 +2841,7 @@ def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
         visited.add(bone_name)
         ordered.append(bone_name)
         
-        children = [name for name, bone in bones.items() if bone.parent == bone_name]
-        for child in sorted(children):
+        for child in sorted(children.get(bone_name, ())):
             visit_bone(child)
     
     for root in sorted(roots):
@@ -2495,6 +2850,36 @@ def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
     return ordered
 
 
+def _quantize_glb_with_gltfpack(glb_path: str) -> bool:
+    """Re-pack an exported .glb with gltfpack so attributes use KHR_mesh_quantization.
+    
+    Optional: leaves the raw export untouched when gltfpack is missing or fails.
+    """
+    import shutil
+    import subprocess
+    
+    gltfpack = shutil.which('gltfpack')
+    if not gltfpack:
+        print("? gltfpack not found in PATH, keeping unquantized .glb")
+        return False
+    
+    packed_path = glb_path[:-len('.glb')] + '_packed.glb' if glb_path.endswith('.glb') else glb_path + '.packed.glb'
+    # -kn/-km keep node and material names so the skeleton and materials stay addressable
+    cmd = [gltfpack, '-i', glb_path, '-o', packed_path, '-kn', '-km']
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"? gltfpack failed: {e}, keeping unquantized .glb")
+        return False
+    if result.returncode != 0 or not os.path.exists(packed_path):
+        print(f"? gltfpack failed: {result.stderr.strip()}, keeping unquantized .glb")
+        return False
+    
+    os.replace(packed_path, glb_path)
+    print(f"? Quantized {glb_path} with gltfpack")
+    return True
+
+
 def run_blender_export_script(script_path: str, descriptor_path: str, output_path: str):
     """Run the Blender export script using Blender's Python interpreter.
     
@@ -2503,21 +2888,20 @@ def run_blender_export_script(script_path: str, descriptor_path: str, output_pat
         descriptor_path: Path to VF3 .TXT descriptor
         output_path: Where to save the .glb file
     """
+    import glob
+    import shutil
     
-    # Try to find Blender executable
-    blender_paths = [
-        "/usr/bin/blender",
-        "/usr/local/bin/blender", 
-        "/opt/blender/blender",
-        "C:\\Program Files\\Blender Foundation\\Blender*\\blender.exe",
-        "blender"  # Hope it's in PATH
-    ]
-    
-    blender_exe = None
-    for path in blender_paths:
-        if os.path.exists(path) or path == "blender":
-            blender_exe = path
-            break
+    # Try to find Blender executable: PATH first, then the usual install locations
+    blender_exe = shutil.which("blender")
+    if not blender_exe:
+        blender_paths = [
+            "/usr/bin/blender",
+            "/usr/local/bin/blender", 
+            "/opt/blender/blender",
+        ]
+        # Versioned Windows install folders need expanding, os.path checks don't glob
+        blender_paths += sorted(glob.glob("C:\\Program Files\\Blender Foundation\\Blender*\\blender.exe"), reverse=True)
+        blender_exe = next((path for path in blender_paths if os.path.isfile(path)), None)
     
     if not blender_exe:
         print("? Could not find Blender executable. Please install Blender or add it to PATH.")
@@ -2621,14 +3005,15 @@ if __name__ == "__main__":
                 print(f"Failed to load {mesh_path}: {e}")
         
         # Create character in Blender
-        success = create_vf3_character_in_blender(bones, attachments, world_transforms, mesh_data, _clothing_dynamic_meshes, output_path)
+        success = create_vf3_character_in_blender(bones, attachments, world_transforms, mesh_data, _clothing_dynamic_meshes, output_path,
+                                                  quantize='--quantize' in sys.argv)
         
         if success:
             print("? VF3 character created successfully in Blender!")
         else:
             print("? Failed to create VF3 character")
     else:
-        print("Usage: Run this script with Blender: blender --background --python vf3_blender_exporter.py -- input.TXT output.glb")
+        print("Usage: Run this script with Blender: blender --background --python vf3_blender_exporter.py -- [--quantize] input.TXT output.glb")
 
 
 def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_groups, mesh_objects):
@@ -2636,8 +3021,9 @@ def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_group
     Split a contaminated connector mesh by bone groups and merge each group with appropriate targets.
     This fixes the issue where body connector contains arm/hand/waist geometry.
     """
-    print(f"        🚀 STARTING CONNECTOR SPLITTING for {connector_obj.name if connector_obj else 'None'}")
-    print(f"        📊 Input: {len(bone_groups)} bone groups, {len(mesh_objects)} mesh objects")
+    if _DEBUG:
+        print(f"        🚀 STARTING CONNECTOR SPLITTING for {connector_obj.name if connector_obj else 'None'}")
+        print(f"        📊 Input: {len(bone_groups)} bone groups, {len(mesh_objects)} mesh objects")
     
     try:
         import bpy
@@ -2651,7 +3037,8 @@ def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_group
         print("        ❌ No connector object provided")
         return False
         
-    print(f"        🔧 Connector object: {connector_obj.name}, vertices: {len(connector_obj.data.vertices) if connector_obj.data else 'N/A'}")
+    if _DEBUG:
+        print(f"        🔧 Connector object: {connector_obj.name}, vertices: {len(connector_obj.data.vertices) if connector_obj.data else 'N/A'}")
     
     # Define bone group targeting patterns
     bone_group_targets = {
@@ -2693,13 +3080,15 @@ def _split_connector_by_bone_groups(connector_obj, vertex_bone_names, bone_group
         
         # Create a filtered mesh containing only vertices from this bone group
         try:
-            print(f"        🔧 Creating filtered mesh for {bone_name} with {len(vertex_indices)} vertices...")
+            if _DEBUG:
+                print(f"        🔧 Creating filtered mesh for {bone_name} with {len(vertex_indices)} vertices...")
             filtered_mesh = _create_filtered_connector_mesh(
                 connector_obj, vertex_indices, f"{connector_obj.name}_{bone_name}"
             )
             
             if filtered_mesh:
-                print(f"        🔧 Filtered mesh created, attempting merge with {target_meshes[0].name}...")
+                if _DEBUG:
+                    print(f"        🔧 Filtered mesh created, attempting merge with {target_meshes[0].name}...")
                 # Merge the filtered mesh with the target(s)
                 primary_target = target_meshes[0]
                 merge_success = _merge_filtered_mesh_with_target(filtered_mesh, primary_target)
@@ -32,6 +32,7 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     try:
         import bpy
         import bmesh
+        import numpy as np
         from mathutils import Vector, Matrix
     except ImportError:
         print("🚫 Blender Python API not available. Run this script inside Blender or install bpy module.")
@@ -82,21 +83,28 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
             all_parents[attachment.child_name] = attachment.parent_bone
             print(f"  Child bone relationship: {attachment.child_name} -> {attachment.parent_bone}")
     
+    # Parent -> children lookup built once (in bone-name iteration order), shared by the
+    # ordering pass and the tail-direction pass instead of rescanning every bone per bone
+    children_of = {}
+    for name in all_bone_names:
+        parent_name = all_parents.get(name)
+        if parent_name:
+            children_of.setdefault(parent_name, []).append(name)
+    
     # Create bones in hierarchical order (parents before children)
-    def get_hierarchical_order(bone_names, parents):
-        """Get bones in correct order (parents before children)."""
-        roots = [name for name in bone_names if not parents.get(name) or parents.get(name) not in bone_names]
+    def get_hierarchical_order():
+        """Get all_bone_names in correct order (parents before children) using children_of."""
+        roots = [name for name in all_bone_names if not all_parents.get(name) or all_parents.get(name) not in all_bone_names]
         ordered = []
         visited = set()
         
         def visit_bone(bone_name):
-            if bone_name in visited or bone_name not in bone_names:
+            if bone_name in visited or bone_name not in all_bone_names:
                 return
             visited.add(bone_name)
             ordered.append(bone_name)
             
-            children = [name for name in bone_names if parents.get(name) == bone_name]
-            for child in sorted(children):
+            for child in sorted(children_of.get(bone_name, ())):
                 visit_bone(child)
         
         for root in sorted(roots):
@@ -104,7 +112,7 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         
         return ordered
     
-    hierarchical_order = get_hierarchical_order(all_bone_names, all_parents)
+    hierarchical_order = get_hierarchical_order()
     print(f"  Bone creation order: {hierarchical_order}")
     
     for bone_name in hierarchical_order:
@@ -121,7 +129,7 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         edit_bone.head = head_pos
         
         # Set bone tail to point toward first child for natural rotation
-        child_bones = [name for name in all_bone_names if all_parents.get(name) == bone_name]
+        child_bones = children_of.get(bone_name)
         if child_bones:
             # Point bone toward first child
             first_child_name = child_bones[0]
@@ -151,7 +159,13 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     
     # Step 5: Create meshes and bind to armature
     print("🔧 Creating and binding meshes...")
+    from vf3_uv_handler import preserve_and_apply_uv_coordinates
+    from vf3_uv_materials import _create_blender_materials
+    from vf3_blender_exporter import _faces_need_validation, _fill_mesh_from_arrays
     mesh_objects = []
+    # Material-applied trimesh per resource_id, so attachments that reuse a resource
+    # don't reload and re-mask its texture
+    prepared_meshes = {}
     
     for att in attachments:
         if att.resource_id not in mesh_data:
@@ -164,38 +178,39 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
             continue
             
         # Apply trimesh materials BEFORE converting to Blender (like original script)
-        if 'materials' in mesh_info and mesh_info['materials']:
-            trimesh_mesh = _apply_trimesh_materials(trimesh_mesh, mesh_info['materials'], mesh_info)
+        if att.resource_id in prepared_meshes:
+            trimesh_mesh = prepared_meshes[att.resource_id]
+        else:
+            if 'materials' in mesh_info and mesh_info['materials']:
+                trimesh_mesh = _apply_trimesh_materials(trimesh_mesh, mesh_info['materials'], mesh_info)
+            prepared_meshes[att.resource_id] = trimesh_mesh
         
         # Create Blender mesh
         mesh_name = f"{att.attach_bone}_{att.resource_id}"
         blender_mesh = bpy.data.meshes.new(mesh_name)
         
-        # Apply world transform to vertices
-        vertices = trimesh_mesh.vertices.copy()
+        # Apply world transform to vertices (float32, the precision Blender stores anyway)
+        vertices = np.array(trimesh_mesh.vertices, dtype=np.float32)
         if att.attach_bone in world_transforms:
-            world_pos = world_transforms[att.attach_bone]
-            vertices += world_pos
+            vertices += np.asarray(world_transforms[att.attach_bone], dtype=np.float32)
         
-        # Set mesh data
-        faces = trimesh_mesh.faces.tolist()
-        blender_mesh.from_pydata(vertices.tolist(), [], faces)
-        blender_mesh.update()
+        # Set mesh data (bulk foreach_set copy instead of from_pydata on Python lists)
+        _fill_mesh_from_arrays(blender_mesh, vertices, trimesh_mesh.faces)
 
-        # Clean up mesh to reduce z-fighting FIRST
-        blender_mesh.validate()  # Fix invalid geometry
+        # Clean up mesh to reduce z-fighting FIRST (validate() only when the
+        # face array actually has something to fix)
+        if _faces_need_validation(trimesh_mesh.faces, len(vertices)):
+            blender_mesh.validate()  # Fix invalid geometry
         
         # DISABLE vertex deduplication entirely - like working export_ciel_to_gltf.py
         # The working version doesn't do vertex deduplication at all
         print(f"  Preserving exact vertex count for {mesh_name} (no deduplication)")
         
         # Assign UVs with exact preservation like working export_ciel_to_gltf.py
-        from vf3_uv_handler import preserve_and_apply_uv_coordinates
         preserve_and_apply_uv_coordinates(blender_mesh, trimesh_mesh, mesh_name, mesh_info)
         
         # Enable smooth shading for Gouraud-like appearance (same as VF3)
-        for poly in blender_mesh.polygons:
-            poly.use_smooth = True
+        blender_mesh.polygons.foreach_set("use_smooth", np.ones(len(blender_mesh.polygons), dtype=bool))
         print(f"  Enabled smooth shading for {mesh_name} (Gouraud rendering like VF3)")
         
         # Create mesh object
@@ -205,7 +220,6 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
         # Step 5.5: Create and assign Blender materials (needed for glTF export)
         if 'materials' in mesh_info and mesh_info['materials']:
             print(f"  Creating Blender materials for {mesh_name}: {len(mesh_info['materials'])} materials")
-            from vf3_uv_materials import _create_blender_materials
             _create_blender_materials(mesh_obj, mesh_info['materials'], trimesh_mesh, mesh_info)
         else:
             print(f"  No materials found for {mesh_name}")
@@ -226,9 +240,10 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
             # Create vertex group for this bone
             vertex_group = mesh_obj.vertex_groups.new(name=att.attach_bone)
             
-            # Assign all vertices to this bone with weight 1.0
-            vertex_indices = list(range(len(vertices)))
-            vertex_group.add(vertex_indices, 1.0, 'REPLACE')
+            # Assign all vertices to this bone with weight 1.0. Kept as a vertex group
+            # rather than bone parenting: bone-based splitting reads these groups and
+            # object.join only carries vertex groups across.
+            vertex_group.add(range(len(vertices)), 1.0, 'REPLACE')
             
             # Add armature modifier
             armature_modifier = mesh_obj.modifiers.new(name="Armature", type='ARMATURE')
@@ -292,19 +307,20 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     except:
         print("🔧 Could not set viewport mode (running headless)")
     
-    bpy.ops.object.select_all(action='DESELECT')
-    armature_obj.select_set(True)
+    # Gather the export set in its own collection and make it the active one, so the
+    # exporter reads it directly instead of needing a per-object selection pass
+    export_collection = bpy.data.collections.new("VF3_Export")
+    bpy.context.scene.collection.children.link(export_collection)
+    export_collection.objects.link(armature_obj)
     
-    # Select only valid mesh objects that still exist in the scene after merging
+    # Only mesh objects that still exist in the scene after merging
     current_mesh_objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
     for mesh_obj in current_mesh_objects:
-        try:
-            mesh_obj.select_set(True)
-        except ReferenceError:
-            # Object was deleted during merging, skip it
-            continue
+        export_collection.objects.link(mesh_obj)
+    bpy.context.view_layer.active_layer_collection = \
+        bpy.context.view_layer.layer_collection.children[export_collection.name]
     
-    print(f"  Selected {len(current_mesh_objects)} mesh objects for export")
+    print(f"  Collected {len(current_mesh_objects)} mesh objects for export")
     
     bpy.context.view_layer.objects.active = armature_obj
     
@@ -318,16 +334,19 @@ def create_vf3_character_in_blender(bones: Dict, attachments: List, world_transf
     
     # Step 9: Export to glTF
     print(f"📦 Exporting to {output_path}...")
+    # Only ask the exporter for vertex colours when some mesh actually carries them
+    has_vertex_colors = any(getattr(obj.data, 'color_attributes', None) for obj in current_mesh_objects)
     try:
         bpy.ops.export_scene.gltf(
             filepath=output_path,
             check_existing=False,
             export_format='GLB',
-            use_selection=True,
-            export_apply=True,
+            use_active_collection=True,
+            export_apply=False,  # Only the Armature modifier exists and skinning exports it
+            export_tangents=False,  # Diffuse/alpha materials only - no normal maps to feed
             export_yup=True,
             export_materials='EXPORT',
-            export_colors=True,
+            export_colors=has_vertex_colors,
             export_cameras=False,
             export_extras=False,
             export_lights=False,
@@ -435,12 +454,12 @@ def _apply_trimesh_materials(mesh: 'trimesh.Trimesh', materials: List[dict], mes
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
         
-        # Black-as-alpha processing (same as original)
-        data = np.array(img)
+        # Black-as-alpha processing (same as original): only the alpha plane is rebuilt,
+        # and PIL swaps it in place instead of re-wrapping a full RGBA copy
+        data = np.asarray(img)
         black_mask = np.all(data[:, :, :3] < 10, axis=2)
-        data[black_mask, 3] = 0
+        img.putalpha(Image.fromarray(np.where(black_mask, 0, data[:, :, 3]).astype(np.uint8), 'L'))
         
-        img = Image.fromarray(data, 'RGBA')
         material.baseColorTexture = img
         material.alphaMode = 'MASK'
         material.alphaCutoff = 0.1
@@ -474,16 +493,15 @@ def _find_in_data_root(filename: str, mesh_info: dict) -> str:
     if 'source_path' not in mesh_info:
         return None
     
+    from vf3_blender_exporter import _index_data_dir
+    
     current_dir = os.path.dirname(mesh_info['source_path'])
     
     # Walk up the directory tree to find 'data' root
     while current_dir and current_dir != os.path.dirname(current_dir):
         if os.path.basename(current_dir) == 'data':
-            # Search recursively in data directory
-            for root, dirs, files in os.walk(current_dir):
-                if filename in files:
-                    return os.path.join(root, filename)
-            break
+            # Search recursively in data directory (walked once, then indexed)
+            return _index_data_dir(current_dir, lowercase=False).get(filename)
         current_dir = os.path.dirname(current_dir)
     
     return None
@@ -617,6 +635,10 @@ def _collect_attachments_with_occupancy_filtering(desc, include_skin=True, inclu
 
 def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
     """Get bones in hierarchical order (parents before children)."""
+    children_of = {}
+    for name, bone in bones.items():
+        if bone.parent:
+            children_of.setdefault(bone.parent, []).append(name)
     roots = [name for name, bone in bones.items() if not bone.parent or bone.parent not in bones]
     
     ordered = []
@@ -628,8 +650,7 @@ def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
         visited.add(bone_name)
         ordered.append(bone_name)
         
-        children = [name for name, bone in bones.items() if bone.parent == bone_name]
-        for child in sorted(children):
+        for child in sorted(children_of.get(bone_name, ())):
             visit_bone(child)
     
     for root in sorted(roots):
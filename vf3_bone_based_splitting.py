@@ -442,6 +442,7 @@ def split_all_meshes_by_bones(mesh_objects) -> Dict[str, List]:
     """
     try:
         import bpy
+        import numpy as np
     except ImportError:
         return {}
     
@@ -494,21 +495,26 @@ def split_all_meshes_by_bones(mesh_objects) -> Dict[str, List]:
                     if has_vf3_materials:
                         print(f"    🎨 VF3 PRESERVED CONNECTOR: {mesh_obj.name} with {len(mesh_obj.data.materials)} materials - assigning to primary group")
                         
-                        # Determine primary anatomical group based on dominant bone assignment
+                        # Determine primary anatomical group based on dominant bone assignment.
+                        # Groups are numbered in first-seen order so the bincount argmax
+                        # breaks ties the same way max() over an insertion-ordered dict did.
                         bone_mapping = get_bone_to_anatomical_group_mapping()
-                        group_vertex_counts = {}
+                        group_ids = {}
+                        vertex_group_ids = []
                         
                         for vertex in mesh_obj.data.vertices:
                             primary_bone = get_vertex_primary_bone(mesh_obj, vertex.index)
                             if primary_bone in bone_mapping:
                                 anatomical_group = bone_mapping[primary_bone]
-                                group_vertex_counts[anatomical_group] = group_vertex_counts.get(anatomical_group, 0) + 1
+                                vertex_group_ids.append(group_ids.setdefault(anatomical_group, len(group_ids)))
                         
                         # Assign to the group with the most vertices
-                        if group_vertex_counts:
-                            primary_group = max(group_vertex_counts, key=group_vertex_counts.get)
+                        if vertex_group_ids:
+                            group_vertex_counts = np.bincount(vertex_group_ids)
+                            primary_idx = int(group_vertex_counts.argmax())
+                            primary_group = list(group_ids)[primary_idx]
                             anatomical_groups[primary_group].append(mesh_obj)
-                            print(f"      Assigned to '{primary_group}' group (dominant with {group_vertex_counts[primary_group]} vertices)")
+                            print(f"      Assigned to '{primary_group}' group (dominant with {group_vertex_counts[primary_idx]} vertices)")
                         else:
                             # Fallback to unassigned
                             anatomical_groups['unassigned'].append(mesh_obj)
@@ -4,6 +4,7 @@ Handles DynamicVisual mesh data and connector creation.
 """
 
 import os
+import re
 import sys
 from typing import List, Dict, Any
 
@@ -24,26 +25,38 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
         print("  No DynamicVisual meshes to process")
         return 0
     
+    from vf3_blender_exporter import _build_snap_grid, _fill_mesh_from_arrays, _find_nearest_in_grid
+    
     connector_count = 0
     created_regions = set()  # Track regions already created to prevent duplicates
     
-    # Collect all mesh vertices for snapping (with safety checks for deleted objects)
-    all_mesh_vertices = []
+    # Collect all mesh vertices for snapping (with safety checks for deleted objects):
+    # one bulk copy + one matrix multiply per mesh
+    vertex_chunks = []
     for mesh_obj in mesh_objects:
         try:
             # Test if object is still valid by accessing its name
             _ = mesh_obj.name
             if hasattr(mesh_obj.data, 'vertices'):
-                for v in mesh_obj.data.vertices:
-                    world_co = mesh_obj.matrix_world @ v.co
-                    all_mesh_vertices.append(world_co)
+                n = len(mesh_obj.data.vertices)
+                co = np.empty(n * 3, dtype=np.float32)
+                mesh_obj.data.vertices.foreach_get("co", co)
+                m = np.array(mesh_obj.matrix_world, dtype=np.float32)
+                vertex_chunks.append(co.reshape(n, 3) @ m[:3, :3].T + m[:3, 3])
         except (ReferenceError, AttributeError):
             # Object has been deleted during merging, skip it
             continue
     
-    all_mesh_vertices = np.array([[v.x, v.y, v.z] for v in all_mesh_vertices])
+    if vertex_chunks:
+        all_mesh_vertices = np.concatenate(vertex_chunks)
+    else:
+        all_mesh_vertices = np.empty((0, 3), dtype=np.float32)
     print(f"  Collected {len(all_mesh_vertices)} vertices from existing meshes for snapping")
     
+    # Hash the snap targets into a uniform grid (cell = snap distance) once for every block below
+    snap_distance = 0.5
+    snap_grid = _build_snap_grid(all_mesh_vertices, snap_distance)
+    
     for dyn_idx, dyn_data in enumerate(clothing_dynamic_meshes):
         if not (dyn_data and 'vertices' in dyn_data and 'faces' in dyn_data):
             continue
@@ -67,42 +80,33 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
         connector_faces = faces  # Use exact face connectivity from VF3
         
         # Process vertices with their bone binding information + snap to eliminate seams
-        processed_vertices = []
-        vertex_bone_names = []
+        bound_count = min(len(vertices), len(vertex_bones))
+        vertex_bone_names = list(vertex_bones[:bound_count])
         
-        for i, (vertex_tuple, bone_name) in enumerate(zip(vertices, vertex_bones)):
-            pos1, pos2 = vertex_tuple
-            
-            # Get bone's world position
-            bone_pos = world_transforms.get(bone_name, (0.0, 0.0, 0.0))
-            
-            # Use pos1 + bone transform (like regular meshes) - back to original simple logic
-            candidate_pos = [
-                pos1[0] + bone_pos[0],
-                pos1[1] + bone_pos[1], 
-                pos1[2] + bone_pos[2]
-            ]
-            
-            # Snap to nearest existing mesh vertex to eliminate seams/gaps  
-            snapped_pos = _snap_vertex_to_nearest_mesh(candidate_pos, all_mesh_vertices, snap_threshold=0.5)
-            
-            processed_vertices.append(snapped_pos)
-            vertex_bone_names.append(bone_name)
+        # Use pos1 + bone transform (like regular meshes) - back to original simple logic,
+        # as one broadcast add over every vertex
+        pos1_array = np.array([vertex_tuple[0] for vertex_tuple in vertices[:bound_count]], dtype=np.float64).reshape(-1, 3)
+        bone_offsets = np.array([world_transforms.get(bone_name, (0.0, 0.0, 0.0)) for bone_name in vertex_bone_names],
+                                dtype=np.float64).reshape(-1, 3)
+        processed_vertices = pos1_array + bone_offsets
+        
+        # Snap to nearest existing mesh vertex to eliminate seams/gaps: the whole block is
+        # answered by one batched grid query and snapped with one masked assignment
+        nearest = _find_nearest_in_grid(snap_grid, processed_vertices, snap_distance)
+        snapped = nearest >= 0
+        processed_vertices[snapped] = all_mesh_vertices[nearest[snapped]]
         
         # Create ONE Blender mesh for this entire DynamicVisual block (like VF3)
         connector_name = f"dynamic_connector_{connector_count}_vf3mesh"
         blender_mesh = bpy.data.meshes.new(connector_name)
         
-        # Create mesh with EXACT VF3 faces - no modifications
-        vertices_list = [[v[0], v[1], v[2]] for v in processed_vertices]
-        faces_list = connector_faces  # Use exact faces from VF3 FaceArray
-        
-        blender_mesh.from_pydata(vertices_list, [], faces_list)
-        blender_mesh.update()
+        # Create mesh with EXACT VF3 faces - no modifications (FaceArray rows are triangles),
+        # copied straight from the NumPy buffers
+        _fill_mesh_from_arrays(blender_mesh, np.asarray(processed_vertices, dtype=np.float32),
+                               connector_faces.reshape(-1, 3))
         
         # Enable smooth shading
-        for poly in blender_mesh.polygons:
-            poly.use_smooth = True
+        blender_mesh.polygons.foreach_set("use_smooth", np.ones(len(blender_mesh.polygons), dtype=bool))
         
         # Create mesh object
         connector_obj = bpy.data.objects.new(connector_name, blender_mesh)
@@ -122,17 +126,16 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
             _assign_anatomical_material_to_connector(connector_obj, vertex_bone_names, mesh_objects)
             print(f"      ⚠️ Fallback: Created anatomical material for connector {connector_name} (no VF3 materials found)")
         
-        # Bind vertices to their respective bones (like VF3 does with bone flags)
-        created_vertex_groups = set()
+        # Bind vertices to their respective bones (like VF3 does with bone flags), with
+        # indices grouped per bone first so each group gets a single add() with full weight
+        bone_vertex_indices = {}
         for vertex_idx, bone_name in enumerate(vertex_bone_names):
-            if bone_name in created_bones and bone_name not in created_vertex_groups:
-                vertex_group = connector_obj.vertex_groups.new(name=bone_name)
-                created_vertex_groups.add(bone_name)
-            
-            # Bind this vertex to its bone with full weight
-            if bone_name in created_vertex_groups:
-                vertex_group = connector_obj.vertex_groups[bone_name]
-                vertex_group.add([vertex_idx], 1.0, 'REPLACE')
+            if bone_name in created_bones:
+                bone_vertex_indices.setdefault(bone_name, []).append(vertex_idx)
+        
+        for bone_name, vertex_indices in bone_vertex_indices.items():
+            vertex_group = connector_obj.vertex_groups.new(name=bone_name)
+            vertex_group.add(vertex_indices, 1.0, 'REPLACE')
         
         # Add armature modifier
         armature_modifier = connector_obj.modifiers.new(name="Armature", type='ARMATURE')
@@ -160,7 +163,7 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
             # Add to mesh objects list for export only if not merged
             mesh_objects.append(connector_obj)
             connector_materials = [mat.name for mat in connector_obj.data.materials] if connector_obj.data.materials else ['NO_MATERIALS']
-            print(f"    ✅ Created standalone VF3 connector: {connector_name} with {len(vertices_list)} vertices, {len(faces_list)} faces, materials: {connector_materials}")
+            print(f"    ✅ Created standalone VF3 connector: {connector_name} with {len(processed_vertices)} vertices, {len(connector_faces)} faces, materials: {connector_materials}")
         else:
             # Remove merged meshes from mesh_objects list to prevent issues with subsequent connectors
             if merged_mesh_names:
@@ -194,32 +197,6 @@ def _create_dynamic_visual_meshes(clothing_dynamic_meshes, world_transforms, cre
     return connector_count
 
 
-def _snap_vertex_to_nearest_mesh(candidate_pos: List[float], all_mesh_vertices, snap_threshold: float = 0.5) -> List[float]:
-    """Snap a vertex to the nearest mesh vertex if within threshold."""
-    try:
-        import numpy as np
-    except ImportError:
-        return candidate_pos
-    
-    if len(all_mesh_vertices) == 0:
-        return candidate_pos
-    
-    # Calculate distances to all mesh vertices
-    candidate_array = np.array(candidate_pos)
-    distances = np.linalg.norm(all_mesh_vertices - candidate_array, axis=1)
-    
-    # Find the nearest vertex
-    nearest_idx = np.argmin(distances)
-    nearest_distance = distances[nearest_idx]
-    
-    # Snap if within threshold
-    if nearest_distance <= snap_threshold:
-        snapped_pos = all_mesh_vertices[nearest_idx].tolist()
-        return snapped_pos
-    else:
-        return candidate_pos
-
-
 # Legacy functions for compatibility
 def process_vf3_dynamic_visual_faces(vertices, vertex_bones, faces, dyn_idx, world_transforms, 
                                     created_bones, armature_obj, mesh_objects, base_connector_count):
@@ -281,10 +258,13 @@ def _assign_vf3_materials_to_connector(connector_obj, materials, face_materials)
         print(f"        ❌ Face material count mismatch: {len(face_materials)} mappings vs {len(connector_obj.data.polygons)} faces")
 
 
+# VF3 material strings look like "(255,255,255,255)::"
+_MATERIAL_RGBA_RE = re.compile(r'\((\d+),(\d+),(\d+),(\d+)\)')
+
+
 def _parse_vf3_material_color(mat_str):
     """Parse VF3 material string like '(255,255,255,255)::' to RGBA tuple."""
-    import re
-    match = re.search(r'\((\d+),(\d+),(\d+),(\d+)\)', mat_str)
+    match = _MATERIAL_RGBA_RE.search(mat_str)
     if match:
         return tuple(int(x) for x in match.groups())
     return None
@@ -111,8 +111,7 @@ def create_blender_mesh_from_trimesh(trimesh_mesh, mesh_name, bone_name):
     faces = trimesh_mesh.faces
     
     # Create mesh data
-    blender_mesh.from_pydata(vertices.tolist(), [], faces.tolist())
-    blender_mesh.update()
+    blender_mesh.from_pydata(vertices.tolist(), [], faces.tolist())  # Also runs mesh.update()
     
     # Preserve UV coordinates the WORKING way (like export_ciel_to_gltf.py)
     preserve_and_apply_uv_coordinates(blender_mesh, trimesh_mesh, mesh_name)
@@ -124,9 +123,8 @@ def create_blender_mesh_from_trimesh(trimesh_mesh, mesh_name, bone_name):
     mesh_obj = bpy.data.objects.new(mesh_name, blender_mesh)
     bpy.context.collection.objects.link(mesh_obj)
     
-    # Enable smooth shading
-    bpy.context.view_layer.objects.active = mesh_obj
-    bpy.ops.object.shade_smooth()
+    # Enable smooth shading (direct polygon flags, no active-object operator)
+    blender_mesh.polygons.foreach_set("use_smooth", np.ones(len(blender_mesh.polygons), dtype=bool))
     
     return mesh_obj
 
@@ -152,9 +150,15 @@ def apply_trimesh_materials_to_blender(blender_mesh, trimesh_mesh, mesh_name):
                                           width=trimesh_material.baseColorTexture.width,
                                           height=trimesh_material.baseColorTexture.height)
         
-        # Convert PIL image to Blender format
-        pixels = np.array(trimesh_material.baseColorTexture).flatten() / 255.0
-        texture_image.pixels = pixels
+        # Convert PIL image to Blender format: Blender images are always RGBA, and a
+        # contiguous float32 buffer lets foreach_set copy it in one go
+        pil_image = trimesh_material.baseColorTexture
+        if pil_image.mode != 'RGBA':
+            pil_image = pil_image.convert('RGBA')
+        rgba = np.asarray(pil_image)
+        pixels = np.empty(rgba.size, dtype=np.float32)
+        np.multiply(rgba.ravel(), 1.0 / 255.0, out=pixels)
+        texture_image.pixels.foreach_set(pixels)
         
         # Create texture node
         tex_node = blender_mat.node_tree.nodes.new('ShaderNodeTexImage')
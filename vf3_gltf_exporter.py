@@ -10,7 +10,7 @@ from typing import Dict, List, Tuple, Any
 from pygltflib import GLTF2, Scene, Node, Mesh, Primitive, Accessor, BufferView, Buffer
 from pygltflib import Material, Skin
 from pygltflib import ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER
-from pygltflib import FLOAT, UNSIGNED_SHORT, UNSIGNED_INT
+from pygltflib import FLOAT, UNSIGNED_BYTE, UNSIGNED_SHORT, UNSIGNED_INT
 from pygltflib import TRIANGLES
 
 def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms: Dict, 
@@ -41,6 +41,13 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
     
     print(f"? Creating {len(bone_order)} joints in hierarchy order")
     
+    # JOINTS_0 may use UNSIGNED_BYTE when every joint index fits in a byte
+    if len(bone_order) < 256:
+        joint_format, joint_size, joint_component = '<BBBB', 1, UNSIGNED_BYTE
+    else:
+        joint_format, joint_size, joint_component = '<HHHH', 2, UNSIGNED_SHORT
+    vertex_stride = 3*4 + 3*4 + 4*joint_size + 4*4
+    
     # Step 3: Create nodes for joints
     joint_nodes = []
     for i, bone_name in enumerate(bone_order):
@@ -78,19 +85,21 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
             armature_node.children.append(len(joint_nodes) + i)  # Offset for armature
     
     # Step 5: Create inverse bind matrices
-    inverse_bind_matrices = []
-    for bone_name in bone_order:
+    # Kept as one C-contiguous float32 array so its bytes can be spliced
+    # straight into the binary blob
+    inverse_bind_matrices = np.empty((len(bone_order), 4, 4), dtype=np.float32)
+    for i, bone_name in enumerate(bone_order):
         if bone_name in world_transforms:
             world_pos = world_transforms[bone_name]
             # Create bind pose matrix
             bind_matrix = np.eye(4, dtype=np.float32)
             bind_matrix[:3, 3] = np.array(world_pos, dtype=np.float32)
             # Inverse bind matrix
-            inv_bind = np.linalg.inv(bind_matrix)
-            inverse_bind_matrices.extend(inv_bind.flatten().tolist())
+            inverse_bind_matrices[i] = np.linalg.inv(bind_matrix)
         else:
             # Identity matrix
-            inverse_bind_matrices.extend(np.eye(4, dtype=np.float32).flatten().tolist())
+            inverse_bind_matrices[i] = np.eye(4, dtype=np.float32)
+    ibm_bytes = inverse_bind_matrices.tobytes()
     
     # Step 6: Create meshes with proper skinning
     mesh_nodes = []
@@ -131,7 +140,7 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
         joint_idx = joint_indices.get(att.attach_bone, 0)
         for _ in range(len(vertices)):
             # Joint indices (bind all vertices to this bone)
-            vertex_data.extend(struct.pack('<HHHH', joint_idx, 0, 0, 0))
+            vertex_data.extend(struct.pack(joint_format, joint_idx, 0, 0, 0))
             # Weights (full weight to first joint)
             vertex_data.extend(struct.pack('<ffff', 1.0, 0.0, 0.0, 0.0))
         
@@ -139,7 +148,7 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
         indices = trimesh_mesh.faces.flatten()
         index_data = bytearray()
         for idx in indices:
-            index_data.extend(struct.pack('<H', idx + vertex_offset // (3*4 + 3*4 + 4*2 + 4*4)))
+            index_data.extend(struct.pack('<H', idx + vertex_offset // vertex_stride))
         
         # Create primitive
         primitive = Primitive()
@@ -153,7 +162,8 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
         primitive.mode = TRIANGLES
         
         # Create accessors for this mesh
-        _create_accessors_for_mesh(gltf, len(vertices), len(indices), vertex_offset, index_offset)
+        _create_accessors_for_mesh(gltf, len(vertices), len(indices), vertex_offset, index_offset,
+                                   joint_component, joint_size)
         
         primitives.append(primitive)
         
@@ -168,7 +178,7 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
     # Step 7: Create glTF structure
     # Buffer
     buffer = Buffer()
-    buffer.byteLength = len(all_vertex_data) + len(all_index_data) + len(inverse_bind_matrices) * 4
+    buffer.byteLength = len(all_vertex_data) + len(all_index_data) + len(ibm_bytes)
     gltf.buffers.append(buffer)
     
     # BufferViews
@@ -192,7 +202,7 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
     ibm_buffer_view = BufferView()
     ibm_buffer_view.buffer = 0
     ibm_buffer_view.byteOffset = len(all_vertex_data) + len(all_index_data)
-    ibm_buffer_view.byteLength = len(inverse_bind_matrices) * 4
+    ibm_buffer_view.byteLength = len(ibm_bytes)
     gltf.bufferViews.append(ibm_buffer_view)
     
     # Create mesh
@@ -236,7 +246,7 @@ def create_gltf_with_skeleton(bones: Dict, attachments: List, world_transforms:
     gltf.scene = 0
     
     # Set binary data
-    all_data = all_vertex_data + all_index_data + bytearray(struct.pack(f'<{len(inverse_bind_matrices)}f', *inverse_bind_matrices))
+    all_data = all_vertex_data + all_index_data + ibm_bytes
     gltf.set_binary_blob(bytes(all_data))
     
     print(f"? Created glTF with {len(joint_nodes)} joints, {len(primitives)} primitives, and proper skinning")
@@ -266,7 +276,8 @@ def _get_bone_hierarchy_order(bones: Dict) -> List[str]:
     return ordered
 
 
-def _create_accessors_for_mesh(gltf: GLTF2, vertex_count: int, index_count: int, vertex_offset: int, index_offset: int):
+def _create_accessors_for_mesh(gltf: GLTF2, vertex_count: int, index_count: int, vertex_offset: int, index_offset: int,
+                               joint_component: int = UNSIGNED_SHORT, joint_size: int = 2):
     """Create accessors for position, normal, joints, weights, and indices."""
     
     # Position accessor
@@ -291,7 +302,7 @@ def _create_accessors_for_mesh(gltf: GLTF2, vertex_count: int, index_count: int,
     joints_accessor = Accessor()
     joints_accessor.bufferView = 0
     joints_accessor.byteOffset = vertex_offset + vertex_count * 6 * 4
-    joints_accessor.componentType = UNSIGNED_SHORT
+    joints_accessor.componentType = joint_component
     joints_accessor.count = vertex_count
     joints_accessor.type = "VEC4"
     gltf.accessors.append(joints_accessor)
@@ -299,7 +310,7 @@ def _create_accessors_for_mesh(gltf: GLTF2, vertex_count: int, index_count: int,
     # Weights accessor
     weights_accessor = Accessor()
     weights_accessor.bufferView = 0
-    weights_accessor.byteOffset = vertex_offset + vertex_count * 6 * 4 + vertex_count * 4 * 2
+    weights_accessor.byteOffset = vertex_offset + vertex_count * 6 * 4 + vertex_count * 4 * joint_size
     weights_accessor.componentType = FLOAT
     weights_accessor.count = vertex_count
     weights_accessor.type = "VEC4"
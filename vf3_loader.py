@@ -4,13 +4,32 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 
-@dataclass
 class Bone:
-    name: str
-    parent: Optional[str]
-    translation: Tuple[float, float, float]
-    rotation: Tuple[float, float, float] = (0.0, 0.0, 0.0)
-    scale: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+    # Plain class with explicit __slots__: @dataclass(slots=True) needs Python 3.10, newer
+    # than the Python bundled with Blender 2.93-3.0, and a hand-written __slots__ on a
+    # dataclass cannot coexist with the field defaults
+    __slots__ = ('name', 'parent', 'translation', 'rotation', 'scale')
+    
+    def __init__(self, name: str, parent: Optional[str], translation: Tuple[float, float, float],
+                 rotation: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                 scale: Tuple[float, float, float] = (1.0, 1.0, 1.0)):
+        self.name = name
+        self.parent = parent
+        self.translation = translation
+        self.rotation = rotation
+        self.scale = scale
+    
+    def __repr__(self) -> str:
+        return (f"Bone(name={self.name!r}, parent={self.parent!r}, translation={self.translation!r}, "
+                f"rotation={self.rotation!r}, scale={self.scale!r})")
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.name, self.parent, self.translation, self.rotation, self.scale) ==
+                (other.name, other.parent, other.translation, other.rotation, other.scale))
+    
+    __hash__ = None  # Mutable and compared by value, like a non-frozen dataclass
 
 
 @dataclass
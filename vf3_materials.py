@@ -81,12 +81,12 @@ def apply_texture_material(mesh: trimesh.Trimesh, material_with_texture: dict, b
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
         
-        # Black-as-alpha processing
-        data = np.array(img)
+        # Black-as-alpha processing: only the alpha plane is rebuilt, and PIL swaps it
+        # in place instead of re-wrapping a full RGBA copy
+        data = np.asarray(img)
         black_mask = np.all(data[:, :, :3] < 10, axis=2)
-        data[black_mask, 3] = 0
+        img.putalpha(Image.fromarray(np.where(black_mask, 0, data[:, :, 3]).astype(np.uint8), 'L'))
         
-        img = Image.fromarray(data, 'RGBA')
         material.baseColorTexture = img
         material.alphaMode = 'MASK'
         material.alphaCutoff = 0.1
@@ -173,11 +173,13 @@ def merge_same_group_meshes(mesh_parts: List, group_name: str):
         merged_mesh = bpy.context.active_object
         merged_mesh.name = f"VF3_{group_name.title()}"
         
-        # Clean up the merged mesh
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge overlapping vertices
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Clean up the merged mesh - only pay for the edit-mode round trip when
+        # the parts actually share overlapping vertices
+        if _has_close_vertices(merged_mesh.data, 0.001):
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            bpy.ops.mesh.remove_doubles(threshold=0.001)  # Merge overlapping vertices
+            bpy.ops.object.mode_set(mode='OBJECT')
         
         # Log the merge result
         final_bones = [vg.name for vg in merged_mesh.vertex_groups]
@@ -197,6 +199,32 @@ def merge_same_group_meshes(mesh_parts: List, group_name: str):
         return None
 
 
+def _has_close_vertices(mesh, dist: float) -> bool:
+    """Return True if any two vertices of `mesh` are within dist of each other on every axis.
+    
+    Conservative NumPy test for whether remove_doubles(threshold=dist) could merge
+    anything: coordinates are bucketed into cells of 3*dist on 8 grids offset by 0
+    or 1.5*dist per axis. Any pair closer than dist shares a cell on at least one
+    grid, so unique cells on every grid means there is nothing to weld.
+    """
+    import numpy as np
+    
+    count = len(mesh.vertices)
+    if count < 2:
+        return False
+    vertices = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+    vertices = vertices.reshape(count, 3).astype(np.float64)
+    
+    cell = 3.0 * dist
+    for offset in np.ndindex(2, 2, 2):
+        keys = np.floor((vertices + np.multiply(offset, 1.5 * dist)) / cell).astype(np.int64)
+        keys = np.ascontiguousarray(keys).view(np.dtype((np.void, keys.itemsize * 3))).ravel()
+        if len(np.unique(keys)) != len(keys):
+            return True
+    return False
+
+
 def add_armature_modifier_to_merged_group(merged_mesh):
     """
     Add armature modifier to merged anatomical group so it's bound to VF3_Armature.
@@ -42,26 +42,21 @@ def apply_uv_coordinates_exact_like_working_version(blender_mesh, uv_layer, uv_c
     
     print(f"  Applying UV coordinates like working export_ciel_to_gltf.py: {len(uv_coords)} UVs")
     
-    loop_index = 0
-    
     # EXACT logic from working export_ciel_to_gltf.py
     # The key insight: UV coordinates are already correctly stored in trimesh.visual.uv
     # We just need to map them to Blender loops without any transformations
     
-    for poly in blender_mesh.polygons:
-        for loop_idx in poly.loop_indices:
-            vertex_idx = blender_mesh.loops[loop_idx].vertex_index
-            
-            # Use vertex index to get UV coordinate
-            if vertex_idx < len(uv_coords):
-                u, v = uv_coords[vertex_idx]
-                # Apply UV coordinates EXACTLY as they are - no transformations
-                uv_layer[loop_index].uv = (float(u), float(v))
-            else:
-                # Fallback for out-of-range indices
-                uv_layer[loop_index].uv = (0.0, 0.0)
-            
-            loop_index += 1
+    # Gather per-loop UVs by each loop's vertex index in one pass, then write them in one call
+    loop_count = len(blender_mesh.loops)
+    loop_vertex_indices = np.empty(loop_count, dtype=np.int32)
+    blender_mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+    
+    uv_array = np.asarray(uv_coords, dtype=np.float32).reshape(-1, 2)
+    loop_uvs = np.zeros((loop_count, 2), dtype=np.float32)  # (0, 0) fallback for out-of-range indices
+    in_range = loop_vertex_indices < len(uv_array)
+    # Apply UV coordinates EXACTLY as they are - no transformations
+    loop_uvs[in_range] = uv_array[loop_vertex_indices[in_range]]
+    uv_layer.foreach_set("uv", loop_uvs.ravel())
     
     print(f"  ✅ Applied working-version UV mapping to {mesh_name}")
 
@@ -9,6 +9,12 @@ from typing import List, Dict, Any
 import numpy as np
 from PIL import Image
 
+# Blender images already loaded this session, keyed by (realpath, make_alpha)
+_IMAGE_CACHE: Dict[tuple, Any] = {}
+
+# Blender materials already built this session, keyed by _material_cache_key()
+_MATERIAL_CACHE: Dict[tuple, Any] = {}
+
 
 def assign_uv_coordinates(blender_mesh, trimesh_mesh, mesh_info, mesh_name):
     """
@@ -116,6 +122,16 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
             mesh_obj.data.materials.append(existing_mat)
             continue
         
+        # Another mesh may already have built an identical material - share it
+        texture_name = material_data['textures'][0] if material_data.get('textures') else None
+        texture_path = _find_texture_file(texture_name, mesh_info)
+        cache_key = _material_cache_key('single', material_data, texture_path, texture_name)
+        cached_material = _get_cached_material(cache_key)
+        if cached_material is not None:
+            print(f"      Reusing identical material: {cached_material.name}")
+            mesh_obj.data.materials.append(cached_material)
+            continue
+        
         material = bpy.data.materials.new(name=mat_name)
         material.use_nodes = True
         
@@ -143,13 +159,8 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
                 material.blend_method = 'BLEND'
                 bsdf.inputs['Alpha'].default_value = color[3]
         
-        # Handle textures if present
-        if material_data.get('textures'):
-            texture_name = material_data['textures'][0]
-            
-            # Find texture file (same search logic as original)
-            texture_path = _find_texture_file(texture_name, mesh_info)
-            
+        # Handle textures if present (texture_path found above, same search logic as original)
+        if texture_name:
             if texture_path and os.path.exists(texture_path):
                 print(f"      Loading texture: {texture_path}")
                 
@@ -192,8 +203,9 @@ def _create_blender_materials(mesh_obj, materials: List, trimesh_mesh, mesh_info
             else:
                 print(f"      ❌ Texture file not found for material {i}: {texture_name} (searched: {texture_path})")
         
-        # Add material to mesh
+        # Add material to mesh; only fully built materials are shared through the cache
         mesh_obj.data.materials.append(material)
+        _MATERIAL_CACHE[cache_key] = material
     
     # CRITICAL: Assign face materials if available (missing from modular version!)
     _assign_face_materials_to_mesh(mesh_obj, materials, mesh_info, trimesh_mesh)
@@ -220,6 +232,16 @@ def _create_unified_material(mesh_obj, materials: List, mesh_info: dict = None):
         if material_data.get('name'):
             mat_name = f"{mesh_name}_{material_data['name']}_Unified_{i}"
         
+        # Another mesh may already have built an identical material - share it
+        texture_name = material_data['textures'][0] if material_data.get('textures') else None
+        texture_path = _find_texture_file(texture_name, mesh_info)
+        cache_key = _material_cache_key('unified', material_data, texture_path, texture_name)
+        cached_material = _get_cached_material(cache_key)
+        if cached_material is not None:
+            print(f"      Material {i}: Reusing identical material {cached_material.name}")
+            mesh_obj.data.materials.append(cached_material)
+            continue
+        
         material = bpy.data.materials.new(name=mat_name)
         material.use_nodes = True
         
@@ -236,10 +258,7 @@ def _create_unified_material(mesh_obj, materials: List, mesh_info: dict = None):
                 print(f"      Material {i}: Set base color {color}")
         
         # Apply texture if available (respect what .X file specifies)
-        if material_data.get('textures'):
-            texture_name = material_data['textures'][0]
-            texture_path = _find_texture_file(texture_name, mesh_info)
-            
+        if texture_name:
             if texture_path and os.path.exists(texture_path):
                 print(f"      Material {i}: Loading texture {texture_name}")
                 
@@ -264,7 +283,7 @@ def _create_unified_material(mesh_obj, materials: List, mesh_info: dict = None):
                         material.node_tree.links.new(texture_node.outputs['Color'], bsdf.inputs['Base Color'])
                         
                         # Simple black-as-alpha for hair textures  
-                        if 'hair' in texture_name.lower():
+                        if is_hair_texture:
                             material.node_tree.links.new(texture_node.outputs['Alpha'], bsdf.inputs['Alpha'])
                             material.blend_method = 'CLIP'  # Clean cutout - black = transparent, color = opaque
                             material.alpha_threshold = 0.5  # Higher threshold for cleaner cutout
@@ -277,8 +296,9 @@ def _create_unified_material(mesh_obj, materials: List, mesh_info: dict = None):
             else:
                 print(f"      Material {i}: No texture or texture not found")
         
-        # Add material to mesh
+        # Add material to mesh; only fully built materials are shared through the cache
         mesh_obj.data.materials.append(material)
+        _MATERIAL_CACHE[cache_key] = material
     
     # CRITICAL: Assign face materials properly while preserving UV coordinates
     _assign_face_materials_to_unified_mesh(mesh_obj, materials, mesh_info)
@@ -286,6 +306,27 @@ def _create_unified_material(mesh_obj, materials: List, mesh_info: dict = None):
     print(f"    ✅ Created {len(materials)} unified materials with proper face assignments")
 
 
+def _material_cache_key(variant: str, material_data: dict, texture_path: str, texture_name: str) -> tuple:
+    """Hashable identity of everything a material builder reads from one material entry."""
+    diffuse = material_data.get('diffuse')
+    return (variant,
+            tuple(diffuse) if diffuse is not None else None,
+            os.path.realpath(texture_path) if texture_path and os.path.exists(texture_path) else None,
+            bool(texture_name) and 'hair' in texture_name.lower())
+
+
+def _get_cached_material(cache_key: tuple):
+    """Return the material built for cache_key if it still exists in bpy.data."""
+    cached = _MATERIAL_CACHE.get(cache_key)
+    if cached is not None:
+        try:
+            cached.name  # Raises ReferenceError if the material was removed since
+            return cached
+        except ReferenceError:
+            del _MATERIAL_CACHE[cache_key]
+    return None
+
+
 def _assign_face_materials_to_unified_mesh(mesh_obj, materials, mesh_info):
     """Assign face materials to unified mesh while preserving UV coordinates."""
     try:
@@ -303,14 +344,18 @@ def _assign_face_materials_to_unified_mesh(mesh_obj, materials, mesh_info):
         # Handle face count - allow slight mismatches from Blender vertex merging/degenerate face removal
         face_count_diff = len(face_materials) - len(mesh_obj.data.polygons)
         if abs(face_count_diff) <= 5:  # Allow up to 5 faces difference for small mesh cleanup
-            # Direct assignment with bounds checking (truncate extra assignments)
-            assigned_count = 0
-            max_assignments = min(len(face_materials), len(mesh_obj.data.polygons))
-            for face_idx in range(max_assignments):
-                mat_idx = face_materials[face_idx]
-                if mat_idx < len(materials):
-                    mesh_obj.data.polygons[face_idx].material_index = mat_idx
-                    assigned_count += 1
+            # Direct assignment with bounds checking (truncate extra assignments), as one
+            # foreach_get/foreach_set round trip; out-of-range faces keep their current index
+            polygons = mesh_obj.data.polygons
+            max_assignments = min(len(face_materials), len(polygons))
+            material_indices = np.empty(len(polygons), dtype=np.int32)
+            polygons.foreach_get("material_index", material_indices)
+            
+            requested = np.asarray(face_materials[:max_assignments], dtype=np.int64)
+            valid = (requested >= 0) & (requested < len(materials))
+            material_indices[:max_assignments][valid] = requested[valid]
+            polygons.foreach_set("material_index", material_indices)
+            assigned_count = int(valid.sum())
             
             if face_count_diff != 0:
                 print(f"    ✅ Assigned face materials to unified mesh: {assigned_count}/{max_assignments} faces (face count diff: {face_count_diff})")
@@ -359,16 +404,15 @@ def _find_in_data_root(filename: str, mesh_info: dict) -> str:
     if 'source_path' not in mesh_info:
         return None
     
+    from vf3_blender_exporter import _index_data_dir
+    
     current_dir = os.path.dirname(mesh_info['source_path'])
     
     # Walk up the directory tree to find 'data' root
     while current_dir and current_dir != os.path.dirname(current_dir):
         if os.path.basename(current_dir) == 'data':
-            # Search recursively in data directory
-            for root, dirs, files in os.walk(current_dir):
-                if filename in files:
-                    return os.path.join(root, filename)
-            break
+            # Search recursively in data directory (walked once, then indexed)
+            return _index_data_dir(current_dir, lowercase=False).get(filename)
         current_dir = os.path.dirname(current_dir)
     
     return None
@@ -396,8 +440,10 @@ def _ensure_alpha_from_black(image_path: str) -> str:
             # Convert to numpy for processing
             data = np.array(img)
             
-            # Make black pixels transparent (same threshold as original)
-            black_mask = np.all(data[:, :, :3] < 10, axis=2)
+            # Make black pixels transparent (same threshold as original); one max
+            # reduction instead of three compares plus an all(). The RGBA copy is
+            # written even when nothing is black so the texture always loads with alpha
+            black_mask = data[:, :, :3].max(axis=2) < 10
             data[black_mask, 3] = 0  # Set alpha to 0 for black pixels
             
             # Save processed image
@@ -450,7 +496,6 @@ def _assign_face_materials_to_mesh(mesh_obj, materials, mesh_info, trimesh_mesh)
     if face_materials is not None and len(face_materials) > 0:
         print(f"    Assigning face materials: {len(face_materials)} face assignments to {len(mesh_obj.data.polygons)} polygons")
         
-        mesh_obj.data.update()
         if len(mesh_obj.data.polygons) > 0:
             # CRITICAL FIX: Handle potential face reordering by from_pydata()
             # Verify that the face count matches exactly
@@ -516,6 +561,15 @@ def _load_image_with_black_as_alpha(image_path: str, make_alpha: bool) -> 'bpy.t
     if not os.path.exists(image_path):
         return None
     
+    cache_key = (os.path.realpath(image_path), bool(make_alpha))
+    cached = _IMAGE_CACHE.get(cache_key)
+    if cached is not None:
+        try:
+            cached.name  # Raises ReferenceError if the image was removed since
+            return cached
+        except ReferenceError:
+            del _IMAGE_CACHE[cache_key]
+    
     try:
         # If make_alpha is True, process the image to convert black to transparent
         if make_alpha:
@@ -527,7 +581,9 @@ def _load_image_with_black_as_alpha(image_path: str, make_alpha: bool) -> 'bpy.t
         # Check if image already loaded
         image_name = os.path.basename(image_path)
         if image_name in bpy.data.images:
-            return bpy.data.images[image_name]
+            image = bpy.data.images[image_name]
+            _IMAGE_CACHE[cache_key] = image
+            return image
         
         # Load image
         image = bpy.data.images.load(image_path)
@@ -537,6 +593,7 @@ def _load_image_with_black_as_alpha(image_path: str, make_alpha: bool) -> 'bpy.t
         # Non-Color makes textures invisible in viewport/renders
         image.colorspace_settings.name = 'sRGB'
         
+        _IMAGE_CACHE[cache_key] = image
         return image
     
     except Exception as e: